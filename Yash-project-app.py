@@ -2,22 +2,15 @@ import streamlit as st
 import subprocess
 import os
 import time
-import pymongo
-import google.generativeai as genai
-import speech_recognition as sr
-from PIL import Image, ImageDraw
+import uuid
+import importlib
+import hashlib
+import json
+import types
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import random
-import boto3
-from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
-from streamlit_webrtc import webrtc_streamer, VideoTransformerBase, WebRtcMode
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
-import requests
-from bs4 import BeautifulSoup
-import psutil
-import cv2  # OpenCV for image processing
+from domains.runtime import CommandRunner, RerunProfiler, ResourceRegistry, TerminalLog, remove_quietly
 
 # --- PAGE CONFIGURATION AND STYLING ---
 st.set_page_config(
@@ -34,61 +27,221 @@ def load_css(file_name):
             st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 load_css("assets/style.css")
 
+# --- RERUN PROFILER ---
+profiler = RerunProfiler(os.environ.get("DEVOPS_PROFILE") == "1", os.environ.get("DEVOPS_PROFILE_LOG"))
+
 # --- SESSION STATE INITIALIZATION ---
-if 'terminal_output' not in st.session_state:
-    st.session_state.terminal_output = "Welcome to the Live Terminal!\nCommand output will appear here.\n"
-if 'captured_image' not in st.session_state:
-    st.session_state.captured_image = None
+with profiler.section("session state"):
+    if 'terminal_log' not in st.session_state:
+        st.session_state.terminal_log = TerminalLog()
+        st.session_state.terminal_log.write("Welcome to the Live Terminal!\nCommand output will appear here.\n")
+    if 'captured_image' not in st.session_state:
+        st.session_state.captured_image = None
+    if 'command_runner' not in st.session_state:
+        st.session_state.command_runner = CommandRunner(st.session_state.terminal_log)
+
+# --- LAZY DOMAIN LOADING ---
+# Heavy third-party dependencies and the domain's own backend from domains/
+# are imported the first time their domain is selected, so a cold start only
+# pays for what the operator actually opens, a broken install only takes down
+# the domain that needs it, and reruns never rebuild the backend classes.
+DOMAIN_DEPENDENCIES = {
+    "Python Automation": {"requests": "requests", "bs4": "bs4", "Image": "PIL.Image", "ImageDraw": "PIL.ImageDraw", "psutil": "psutil", "pd": "pandas",
+                          "mail": "domains.mail", "crawler": "domains.crawler", "metrics": "domains.metrics"},
+    "JavaScript + Docker": {"cv2": "cv2", "streamlit_webrtc": "streamlit_webrtc",
+                            "webcam": "domains.webcam", "mail": "domains.mail", "docker": "domains.docker"},
+    "AWS Cloud Tasks": {"boto3": "boto3", "botocore_exceptions": "botocore.exceptions", "aws": "domains.aws"},
+    "Docker CLI": {"docker": "domains.docker"},
+    "Kubernetes": {"k8s_client": "kubernetes.client", "k8s_config": "kubernetes.config", "k8s_watch": "kubernetes.watch", "k8s": "domains.k8s"},
+    "Terraform": {"jobs": "domains.jobs", "terraform": "domains.terraform"},
+    "Ansible": {"jobs": "domains.jobs"},
+    "Generative AI": {"genai": "google.generativeai", "sr": "speech_recognition", "translation": "domains.translation"},
+    "MongoDB Database": {"pymongo": "pymongo", "records": "domains.records"},
+}
+
+@st.cache_resource
+def import_report():
+    """Process-wide record of how long each domain's first import took, in seconds."""
+    return {}
+
+def load_domain(name):
+    """Imports a domain's dependencies and returns them as a namespace, or None if one is missing."""
+    report = import_report()
+    modules = {}
+    for alias, module_name in DOMAIN_DEPENDENCIES.get(name, {}).items():
+        started = time.perf_counter()
+        try:
+            modules[alias] = importlib.import_module(module_name)
+        except ImportError as e:
+            st.error(f"The {name} domain is unavailable: {e}. Install the packages from requirements.txt.")
+            return None
+        report.setdefault(name, {}).setdefault(module_name, time.perf_counter() - started)
+    return types.SimpleNamespace(**modules)
+
+# --- SHARED RESOURCE REGISTRY ---
+@st.cache_resource
+def resource_registry():
+    return ResourceRegistry()
 
 # --- HELPER & CORE FUNCTIONS ---
 def run_command(command, cwd="."):
-    """Executes a shell command and updates the terminal output in session state."""
-    st.session_state.terminal_output += f"\n\n$ cd {cwd} && {command}\n"
-    try:
-        result = subprocess.run(
-            command, shell=True, check=True, stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE, text=True, cwd=cwd
-        )
-        st.session_state.terminal_output += result.stdout
-        if result.stderr:
-            st.session_state.terminal_output += f"--- stderr ---\n{result.stderr}"
-    except subprocess.CalledProcessError as e:
-        error_message = f"--- ERROR ---\nReturn Code: {e.returncode}\n--- stdout ---\n{e.stdout}\n--- stderr ---\n{e.stderr}"
-        st.session_state.terminal_output += error_message
-    except Exception as general_error:
-        st.session_state.terminal_output += f"An unexpected error occurred: {general_error}"
-    st.rerun()
-
-def send_email(recipient, subject, body, attachment_bytes=None):
+    """Queues a shell command on the session's CommandRunner.
+
+    Its output is streamed into the Live Terminal while the page stays
+    responsive.
+    """
+    with profiler.section(f"run_command: {command[:60]}"):
+        st.session_state.command_runner.submit(command, cwd)
+
+# --- MAIL SUBSYSTEM ---
+def mail_settings():
+    return {
+        "host": st.secrets.get("SMTP_HOST", "smtp.gmail.com"), "port": int(st.secrets.get("SMTP_PORT", 587)),
+        "username": st.secrets["SENDER_EMAIL"], "password": st.secrets["SENDER_PASSWORD"],
+        "starttls": bool(st.secrets.get("SMTP_STARTTLS", True)),
+    }
+
+def smtp_pool(mail, settings):
+    return resource_registry().get("smtp", tuple(settings.values()), lambda: mail.SMTPPool(**settings),
+                                   label=f"smtp {settings['host']}:{settings['port']}")
+
+@st.cache_resource
+def mail_queue(_mail):
+    return _mail.MailQueue(workers=int(st.secrets.get("SMTP_WORKERS", 4)))
+
+def queue_email(mail, recipients, subject, body, attachment_bytes=None):
+    """Queues a bulk send and remembers the batch in session state; returns an error message or None."""
     try:
-        sender_email = st.secrets["SENDER_EMAIL"]
-        sender_password = st.secrets["SENDER_PASSWORD"]
-
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
-
-        if attachment_bytes:
-            image = MIMEImage(attachment_bytes, name="capture.jpg")
-            msg.attach(image)
-
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-        return True, "Email sent successfully!"
+        settings = mail_settings()
+        build = mail.message_factory(settings["username"], subject, body, attachment_bytes)
+        st.session_state.mail_batch = mail_queue(mail).submit(smtp_pool(mail, settings), recipients, build)
     except Exception as e:
-        return False, f"Failed to send email: {e}"
+        return f"Failed to queue email: {e}"
+
+def render_mail_batch():
+    batch = st.session_state.get("mail_batch")
+    if batch is None:
+        return
+    rows = batch.rows()
+    sent = sum(1 for r in rows if r["status"] == "sent")
+    failed = sum(1 for r in rows if r["status"].startswith("failed"))
+    elapsed = (batch.finished or time.time()) - batch.started
+    st.caption(f"{sent} sent · {failed} failed · {len(rows) - sent - failed} pending · {elapsed:.1f}s")
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    if batch.finished and st.session_state.get("mail_polling"):
+        st.rerun()
+
+def show_mail_batch():
+    batch = st.session_state.get("mail_batch")
+    st.session_state.mail_polling = batch is not None and batch.finished is None
+    st.fragment(render_mail_batch, run_every=1 if st.session_state.mail_polling else None)()
+
+# --- VOICE COMMAND TRANSLATION ---
+@st.cache_resource
+def translation_cache(_translation):
+    return _translation.TranslationCache()
+
+# --- HOST METRICS SAMPLER ---
+@st.cache_resource
+def metrics_sampler(_metrics, _psutil):
+    return _metrics.MetricsSampler(_psutil)
+
+# --- BACKGROUND JOB SCHEDULER ---
+@st.cache_resource
+def job_scheduler(_jobs):
+    return _jobs.JobScheduler()
+
+def render_jobs_panel(scheduler):
+    """Lists recent background jobs and lets any session attach to one, follow its log or cancel it."""
+    with st.expander("Background Jobs", expanded=True):
+        st.number_input("Concurrent jobs (shared by all sessions):", min_value=1, max_value=16, value=scheduler.concurrency,
+                        key="jobs_concurrency", on_change=lambda: scheduler.set_concurrency(st.session_state.jobs_concurrency))
+
+        def render_jobs():
+            jobs = scheduler.jobs()
+            if not jobs:
+                st.caption("No jobs yet.")
+                return
+            now = time.time()
+            st.dataframe([{
+                "id": j["id"], "name": j["name"], "state": j["state"], "exit": j["returncode"],
+                "runtime_s": round((j["finished"] or now) - j["started"], 1) if j["started"] else None,
+                "created": time.strftime("%H:%M:%S", time.localtime(j["created"])),
+            } for j in jobs], use_container_width=True, hide_index=True)
+            job_id = st.selectbox("Attach to job:", [j["id"] for j in jobs], key="jobs_attached",
+                                  format_func=lambda i: next(f"{j['name']} [{j['state']}] ({i})" for j in jobs if j["id"] == i))
+            job = next(j for j in jobs if j["id"] == job_id)
+            st.code(f"$ {job['command']}\n{scheduler.log_tail(job_id)}", language='bash', line_numbers=False)
+            if job["state"] in ("queued", "running") and st.button("Cancel Job", type="primary", key="jobs_cancel"):
+                scheduler.cancel(job_id)
+
+        st.fragment(render_jobs, run_every=2)()
+
+# --- TERRAFORM ACCELERATION ---
+def terraform_credentials():
+    """The AWS provider's credential variables from secrets.toml, or None if they are not set.
+
+    They reach the provider through its own environment variables: unlike
+    TF_VAR_* input variables they are neither in the job command nor stored
+    in the saved plan.
+    """
+    try:
+        return {name: st.secrets[name] for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY")}
+    except (KeyError, FileNotFoundError):
+        return None
+
+# --- MONGODB RECORD BROWSER ---
+@st.cache_resource
+def ensure_record_indexes(_records, mongo_uri, _collection):
+    """Creates the indexes the record browser relies on, once per process and server."""
+    _records.create_record_indexes(_collection)
+
+# --- WEBCAM SNAPSHOTS ---
+@st.cache_resource
+def snapshot_executor():
+    """Shared pool that converts and encodes snapshots off the script thread."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot")
+
+# --- EC2 INVENTORY ---
+EC2_INVENTORY_TTL = 120
+
+def ec2_client(boto3, access_key, secret_key, region):
+    return resource_registry().get(
+        "ec2", (access_key, secret_key, region), label=f"ec2 {region}",
+        factory=lambda: boto3.client('ec2',
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region
+        )
+    )
 
-# WEBRTC class for photo capture
-class VideoTransformer(VideoTransformerBase):
-    def __init__(self):
-        self.frame = None
-    def transform(self, frame):
-        self.frame = frame.to_ndarray(format="bgr24")
-        return self.frame
+@st.cache_data(ttl=EC2_INVENTORY_TTL, show_spinner=False)
+def ec2_inventory(_aws, regions, credentials_digest, _clients):
+    """Lists instances in every region concurrently; cached per region set and credentials.
+
+    Returns the rows, a {region: error} dict for regions that failed, and when
+    the inventory was fetched.
+    """
+    return (*_aws.list_instances(_clients), time.time())
+
+# --- DOCKER ENGINE API ---
+def docker_engine(docker):
+    return resource_registry().get("docker", ("docker",), docker.DockerEngine, label="docker engine",
+                                   health_check=lambda engine: engine.ping())
+
+@st.cache_resource
+def container_stats_collector(_docker):
+    return _docker.ContainerStatsCollector()
+
+# --- KUBERNETES POD INFORMER ---
+@st.cache_resource
+def pod_informer(_k8s, _k8s_client, _k8s_config, _k8s_watch):
+    try:
+        api_client = _k8s_config.new_client_from_config()
+    except _k8s_config.ConfigException:
+        _k8s_config.load_incluster_config()
+        api_client = _k8s_client.ApiClient()
+    return _k8s.PodInformer(_k8s_client.CoreV1Api(api_client), _k8s_watch)
 
 # --- UI LAYOUT ---
 st.title("DevOps & AI Control Center With Cloud Integration")
@@ -104,13 +257,38 @@ choice = st.sidebar.radio("Select a Domain:", [
     "Jenkins", "Generative AI", "MongoDB Database"
 ])
 
+with st.sidebar.expander("Startup Report"), profiler.section("sidebar: startup report"):
+    report = import_report()
+    if report:
+        rows = [{"domain": d, "module": m, "import_ms": round(t * 1000, 1)} for d, mods in report.items() for m, t in mods.items()]
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        st.write(f"**Total import time:** {sum(r['import_ms'] for r in rows):.1f} ms")
+        st.download_button("Download JSON", json.dumps(report, indent=2), file_name="startup_report.json", mime="application/json")
+    else:
+        st.caption("No domain dependencies loaded yet.")
+
+with st.sidebar.expander("Shared Resources"), profiler.section("sidebar: shared resources"):
+    registry = resource_registry()
+    entries = registry.snapshot()
+    st.write(f"**Pool size:** {len(entries)} | **Reuse hits:** {registry.stats['hits']} | "
+             f"**Builds:** {registry.stats['builds']} | **Reconnects:** {registry.stats['reconnects']} | "
+             f"**Evictions:** {registry.stats['evictions']}")
+    st.write(f"**Total setup time:** {registry.stats['setup_s'] * 1000:.1f} ms")
+    if entries:
+        st.dataframe(entries, use_container_width=True, hide_index=True)
+
 # ==============================================================================
 # MAIN CONTENT AREA (COLUMN 1 - CONTROLS)
 # ==============================================================================
-with col1:
+with col1, profiler.section(f"page: {choice}"):
     st.header(f"{choice}")
+    with profiler.section("load_domain"):
+        domain = load_domain(choice)
 
-    if choice == "Python Automation":
+    if domain is None:
+        pass
+
+    elif choice == "Python Automation":
         with st.expander("1. Send WhatsApp Message", expanded=True):
             st.info("Uses `pywhatkit`. You must be logged into WhatsApp Web in your default browser.", icon="⚠️")
             whatsapp_num = st.text_input("Phone Number (with country code, e.g., +91...)", key="wa_num")
@@ -124,13 +302,17 @@ with col1:
                     st.error(f"Error: {e}")
 
         with st.expander("2. Send Standard Email"):
-            email_to = st.text_input("Recipient Email:", key="email_to")
+            email_to = st.text_input("Recipient Email(s), comma-separated:", key="email_to")
+            email_list = st.file_uploader("Or upload a recipient list (one address per line):", type=["txt", "csv"], key="email_list")
             email_sub = st.text_input("Subject:", key="email_sub")
             email_body = st.text_area("Body:", key="email_body")
             if st.button("Send Email"):
-                success, msg = send_email(email_to, email_sub, email_body)
-                if success: st.success(msg)
-                else: st.error(msg)
+                recipients = domain.mail.parse_recipients(email_to, email_list)
+                if not recipients:
+                    st.warning("Please enter at least one recipient email.")
+                elif error := queue_email(domain.mail, recipients, email_sub, email_body):
+                    st.error(error)
+            show_mail_batch()
         
         with st.expander("3. Send SMS via Twilio"):
             sms_to = st.text_input("Recipient Phone Number:", key="sms_to")
@@ -170,23 +352,26 @@ with col1:
                     st.error(f"Search failed. This can happen if Google temporarily blocks requests. Please wait a bit. Error: {e}")
         
         with st.expander("5. Download Website Data"):
-            url = st.text_input("Enter Website URL:", "http://info.cern.ch")
+            seed_urls = st.text_area("Enter Website URL(s), one per line:", "http://info.cern.ch", key="crawl_seeds")
+            c1, c2, c3 = st.columns(3)
+            crawl_depth = c1.number_input("Link depth:", min_value=0, max_value=5, value=0, key="crawl_depth")
+            crawl_workers = c2.number_input("Concurrent requests:", min_value=1, max_value=32, value=8, key="crawl_workers")
+            crawl_max_pages = c3.number_input("Max pages:", min_value=1, max_value=5000, value=200, key="crawl_max_pages")
             if st.button("Download Website HTML"):
-                try:
-                    r = requests.get(url)
-                    r.raise_for_status()
-                    os.makedirs("website_data", exist_ok=True)
-                    with open("website_data/index.html", "w", encoding='utf-8') as f:
-                        f.write(r.text)
-                    st.success("Website HTML saved to `website_data/index.html`.")
-                    run_command("ls -l website_data")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"Could not download website: {e}")
+                seeds = [u.strip() for u in seed_urls.splitlines() if u.strip()]
+                if seeds:
+                    fetcher = domain.crawler.SiteFetcher(domain.requests, domain.bs4, workers=crawl_workers)
+                    st.session_state.command_runner.submit_task(
+                        f"crawl {' '.join(seeds)} --depth {crawl_depth}",
+                        lambda emit: fetcher.crawl(seeds, crawl_depth, emit, crawl_max_pages))
+                    st.success("Download started. Pages are saved under `website_data/`; progress is in the terminal.")
+                else:
+                    st.error("Please enter at least one URL.")
         
         with st.expander("7. Create Digital Scenery"):
             if st.button("Generate Image"):
-                img = Image.new('RGB', (800, 600), color='#87CEEB')
-                draw = ImageDraw.Draw(img)
+                img = domain.Image.new('RGB', (800, 600), color='#87CEEB')
+                draw = domain.ImageDraw.Draw(img)
                 draw.rectangle((0, 500, 800, 600), fill='green')
                 draw.ellipse((600, 50, 750, 200), fill='yellow', outline='orange')
                 for _ in range(random.randint(2, 5)):
@@ -198,7 +383,7 @@ with col1:
         
         with st.expander("8. Read System RAM"):
             if st.button("Check RAM Usage"):
-                ram = psutil.virtual_memory()
+                ram = domain.psutil.virtual_memory()
                 total_gb = ram.total / (1024**3)
                 used_gb = ram.used / (1024**3)
                 percent = ram.percent
@@ -206,135 +391,375 @@ with col1:
                 st.write(f"**Used RAM:** {used_gb:.2f} GB")
                 st.progress(percent / 100)
                 st.write(f"**Usage:** {percent}%")
+
+        with st.expander("9. Live Host Metrics"):
+            sampler = metrics_sampler(domain.metrics, domain.psutil)
+            c1, c2 = st.columns(2)
+            c1.select_slider("Sampling interval (s, shared by all sessions):", [1, 2, 5, 10, 30], value=sampler.interval, key="metrics_interval",
+                             on_change=lambda: setattr(sampler, "interval", st.session_state.metrics_interval))
+            windows = {"5 minutes": 300, "15 minutes": 900, "1 hour": 3600, "Everything buffered": None}
+            window = c2.selectbox("Window:", list(windows), key="metrics_window")
+
+            def render_metrics():
+                columns = sampler.window(windows[window])
+                if not columns["time"]:
+                    st.caption("Waiting for the first samples...")
+                    return
+                frame = domain.pd.DataFrame(domain.metrics.downsample(columns))
+                frame["time"] = domain.pd.to_datetime(frame["time"], unit="s")
+                frame = frame.set_index("time")
+                st.line_chart(frame[["cpu_percent", "memory_percent"]])
+                st.line_chart(frame[["disk_read_mbps", "disk_write_mbps"]])
+                st.line_chart(frame[["net_sent_mbps", "net_recv_mbps"]])
+                st.caption(f"{len(columns['time'])} samples in window · {sampler.count}/{sampler.capacity} buffered · every {sampler.interval}s")
+
+            st.fragment(render_metrics, run_every=max(2, sampler.interval))()
+            full = sampler.window(windows[window])
+            st.download_button("Export CSV", domain.pd.DataFrame(full).to_csv(index=False), file_name="host_metrics.csv", mime="text/csv")
     
     elif choice == "JavaScript + Docker":
         with st.expander("1. Capture Photo from Webcam", expanded=True):
-            webrtc_ctx = webrtc_streamer(
-                key="webcam-capture", mode=WebRtcMode.SENDRECV,
-                video_transformer_factory=VideoTransformer
+            # WEBRTC class for photo capture. It only keeps a reference to the
+            # latest raw frame; conversion and encoding happen on snapshot.
+            class SnapshotProcessor(domain.streamlit_webrtc.VideoProcessorBase):
+                def __init__(self):
+                    self.frame = None
+                    self.stats = domain.webcam.FrameStats()
+                def recv(self, frame):
+                    self.frame = frame
+                    self.stats.record(frame.time if frame.time is not None else time.perf_counter())
+                    return frame
+
+            webrtc_ctx = domain.streamlit_webrtc.webrtc_streamer(
+                key="webcam-capture", mode=domain.streamlit_webrtc.WebRtcMode.SENDRECV,
+                video_processor_factory=SnapshotProcessor
             )
-            if webrtc_ctx.video_transformer and st.button("Snap Photo"):
-                captured_frame = webrtc_ctx.video_transformer.frame
-                if captured_frame is not None:
-                    is_success, buffer = cv2.imencode(".jpg", captured_frame)
-                    st.session_state.captured_image = buffer.tobytes()
-                    st.success("Photo captured!")
+            c1, c2 = st.columns(2)
+            snapshot_width = c1.selectbox("Snapshot width:", [None, 1280, 640, 320], key="snapshot_width",
+                                          format_func=lambda w: "Original" if w is None else f"{w}px")
+            snapshot_quality = c2.slider("JPEG quality:", 30, 100, 90, key="snapshot_quality")
+            processor = webrtc_ctx.video_processor
+            if processor and st.button("Snap Photo"):
+                if processor.frame is not None:
+                    st.session_state.snapshot_job = snapshot_executor().submit(
+                        domain.webcam.encode_snapshot, domain.cv2, processor.frame, snapshot_width, snapshot_quality)
+
+            def render_capture_status():
+                job = st.session_state.get("snapshot_job")
+                if job is not None and job.done():
+                    st.session_state.snapshot_job = None
+                    try:
+                        st.session_state.captured_image, cpu_seconds = job.result()
+                        st.session_state.setdefault("snapshot_cpu", deque(maxlen=20)).append(cpu_seconds)
+                        st.session_state.snapshot_notice = None
+                    except Exception as e:
+                        st.session_state.snapshot_notice = f"Could not encode the snapshot: {e}"
+                    st.rerun()
+                elif job is not None:
+                    st.caption("Encoding snapshot...")
+                if processor:
+                    stats = processor.stats.summary()
+                    st.caption(f"{stats['fps']} fps · {stats['frames']} frames · {stats['dropped']} dropped")
+                costs = st.session_state.get("snapshot_cpu")
+                if costs:
+                    st.caption(f"Snapshot convert + resize + JPEG encode: {costs[-1] * 1000:.1f} ms CPU last, "
+                               f"{sum(costs) / len(costs) * 1000:.1f} ms average over {len(costs)}")
+
+            st.fragment(render_capture_status, run_every=0.5 if processor or st.session_state.get("snapshot_job") else None)()
+            if "snapshot_notice" in st.session_state:
+                notice = st.session_state.pop("snapshot_notice")
+                if notice: st.error(notice)
+                else: st.success("Photo captured!")
             if st.session_state.captured_image:
                 st.image(st.session_state.captured_image, caption="Your Captured Photo")
 
         with st.expander("2. Send Captured Photo via Email"):
-            photo_email_to = st.text_input("Recipient Email for Photo:")
+            photo_email_to = st.text_input("Recipient Email(s) for Photo, comma-separated:")
             if st.button("Send Captured Photo"):
-                if st.session_state.captured_image and photo_email_to:
-                    success, msg = send_email(photo_email_to, "Photo from DevOps Control Center", "Here is the photo you captured.", st.session_state.captured_image)
-                    if success: st.success(msg)
-                    else: st.error(msg)
+                recipients = domain.mail.parse_recipients(photo_email_to)
+                if st.session_state.captured_image and recipients:
+                    if error := queue_email(domain.mail, recipients, "Photo from DevOps Control Center", "Here is the photo you captured.", st.session_state.captured_image):
+                        st.error(error)
                 else:
                     st.warning("Please capture a photo and enter a recipient email first.")
+            show_mail_batch()
 
         with st.expander("5. Launch Flask App in Docker"):
-            flask_port = st.number_input("Expose on Port:", min_value=1024, value=5001, key="flask_port")
+            c1, c2 = st.columns(2)
+            flask_port = c1.number_input("Expose on Port:", min_value=1024, value=5001, key="flask_port")
+            flask_replicas = c2.number_input("Replicas:", min_value=1, max_value=50, value=1, key="flask_replicas")
             if st.button("Launch Flask Container"):
-                os.makedirs("flask_app", exist_ok=True)
-                with open("flask_app/app.py", "w") as f:
-                    f.write("from flask import Flask\napp = Flask(__name__)\n@app.route('/')\ndef hello(): return '<h1>Hello from Flask in Docker!</h1>'\nif __name__ == '__main__': app.run(host='0.0.0.0', port=5000)")
-                with open("flask_app/Dockerfile", "w") as f:
-                    f.write("FROM python:3.9-slim\nWORKDIR /app\nRUN pip install Flask\nCOPY app.py .\nCMD [\"python3\", \"-u\", \"app.py\"]")
-                run_command("docker build -t my-flask-app .", cwd="flask_app")
-                run_command(f"docker run -d --rm -p {flask_port}:5000 --name flask_container my-flask-app")
-                st.success(f"Flask app container launched! Access at: http://localhost:{flask_port}")
+                engine = docker_engine(domain.docker)
+                st.session_state.command_runner.submit_task(
+                    f"launch {domain.docker.DEMO_APPS['flask']['repository']} x{flask_replicas} on port {flask_port} (Engine API)",
+                    lambda emit: domain.docker.launch_demo_app(engine, domain.docker.DEMO_APPS["flask"], flask_port, flask_replicas, emit))
+                st.success(f"Flask app launch queued on ports {flask_port}-{flask_port + flask_replicas - 1}. Progress is in the terminal.")
 
         with st.expander("6. Launch Apache Server in Docker"):
-            apache_port = st.number_input("Expose on Port:", min_value=1024, value=8081, key="apache_port")
+            c1, c2 = st.columns(2)
+            apache_port = c1.number_input("Expose on Port:", min_value=1024, value=8081, key="apache_port")
+            apache_replicas = c2.number_input("Replicas:", min_value=1, max_value=50, value=1, key="apache_replicas")
             if st.button("Launch Apache Container"):
-                os.makedirs("apache_server", exist_ok=True)
-                with open("apache_server/index.html", "w") as f: f.write("<h1>Apache server in Docker is LIVE!</h1>")
-                with open("apache_server/Dockerfile", "w") as f: f.write("FROM httpd:2.4\nCOPY ./index.html /usr/local/apache2/htdocs/")
-                run_command("docker build -t my-apache-server .", cwd="apache_server")
-                run_command(f"docker run -d --rm -p {apache_port}:80 --name apache_container my-apache-server")
-                st.success(f"Apache container launched! Access at: http://localhost:{apache_port}")
+                engine = docker_engine(domain.docker)
+                st.session_state.command_runner.submit_task(
+                    f"launch {domain.docker.DEMO_APPS['apache']['repository']} x{apache_replicas} on port {apache_port} (Engine API)",
+                    lambda emit: domain.docker.launch_demo_app(engine, domain.docker.DEMO_APPS["apache"], apache_port, apache_replicas, emit))
+                st.success(f"Apache launch queued on ports {apache_port}-{apache_port + apache_replicas - 1}. Progress is in the terminal.")
                 
     elif choice == "AWS Cloud Tasks":
          with st.expander("Manage EC2 Instances", expanded=True):
             st.info("Requires AWS credentials configured in your `secrets.toml` file.", icon="🔑")
             try:
-                ec2 = boto3.client('ec2',
-                    aws_access_key_id=st.secrets['AWS_ACCESS_KEY_ID'],
-                    aws_secret_access_key=st.secrets['AWS_SECRET_ACCESS_KEY'],
-                    region_name=st.secrets['AWS_DEFAULT_REGION']
-                )
-                if st.button("List EC2 Instances"):
-                    run_command(f"aws ec2 describe-instances --region {st.secrets['AWS_DEFAULT_REGION']} --output table")
-
-                if st.button("Launch a new t2.micro EC2 Instance"):
-                    st.info("Sending launch request for a t2.micro with Amazon Linux 2 AMI...")
-                    run_command(f"aws ec2 run-instances --image-id ami-0c55b159cbfafe1f0 --instance-type t2.micro --region {st.secrets['AWS_DEFAULT_REGION']}")
-                
-                instance_to_terminate = st.text_input("Enter Instance ID to Terminate:")
-                if st.button("Terminate Instance", type="primary"):
-                    if instance_to_terminate:
-                        st.warning(f"Sending termination request for {instance_to_terminate}...")
-                        run_command(f"aws ec2 terminate-instances --instance-ids {instance_to_terminate} --region {st.secrets['AWS_DEFAULT_REGION']}")
+                access_key, secret_key = st.secrets['AWS_ACCESS_KEY_ID'], st.secrets['AWS_SECRET_ACCESS_KEY']
+                default_region = st.secrets['AWS_DEFAULT_REGION']
+                ec2 = ec2_client(domain.boto3, access_key, secret_key, default_region)
+
+                regions_text = st.text_input("Regions (comma-separated):", default_region, key="ec2_regions")
+                regions = tuple(sorted({r.strip() for r in regions_text.split(",") if r.strip()})) or (default_region,)
+                clients, client_errors = {}, {}
+                for region in regions:
+                    try:
+                        clients[region] = ec2_client(domain.boto3, access_key, secret_key, region)
+                    except (domain.botocore_exceptions.BotoCoreError, ValueError) as e:
+                        # e.g. InvalidRegionError for a typo such as "us east 1"
+                        client_errors[region] = str(e)
+                credentials_digest = hashlib.sha256(f"{access_key}:{secret_key}".encode()).hexdigest()
+
+                if st.button("Refresh Inventory"):
+                    ec2_inventory.clear()
+                started = time.perf_counter()
+                rows, errors, fetched_at = (ec2_inventory(domain.aws, tuple(clients), credentials_digest, clients) if clients
+                                            else ([], {}, time.time()))
+                errors = {**client_errors, **errors}
+                st.caption(f"{len(rows)} instances in {len(regions)} region(s) · loaded in {(time.perf_counter() - started) * 1000:.0f} ms · "
+                           f"fetched {time.time() - fetched_at:.0f}s ago (cached for {EC2_INVENTORY_TTL}s)")
+                for region, error in errors.items():
+                    st.error(f"{region}: {error}")
+
+                f1, f2 = st.columns([2, 1])
+                instance_filter = f1.text_input("Filter instances:", key="ec2_filter").lower()
+                hide_terminated = f2.checkbox("Hide terminated", value=True, key="ec2_hide_terminated")
+                visible = [r for r in rows if not (hide_terminated and r["state"] == "terminated")
+                           and (not instance_filter or any(instance_filter in str(v).lower() for v in r.values()))]
+                st.dataframe(visible, use_container_width=True, hide_index=True)
+
+                c1, c2 = st.columns([1, 2])
+                launch_count = c1.number_input("Instances:", min_value=1, max_value=20, value=1, key="ec2_launch_count")
+                if c2.button(f"Launch t2.micro EC2 Instance(s) in {default_region}"):
+                    st.info("Sending launch request for t2.micro with Amazon Linux 2 AMI...")
+                    response = ec2.run_instances(ImageId="ami-0c55b159cbfafe1f0", InstanceType="t2.micro",
+                                                 MinCount=launch_count, MaxCount=launch_count)
+                    launched = [i["InstanceId"] for i in response["Instances"]]
+                    st.session_state.terminal_log.write(f"\n\n[boto3] run_instances {default_region}: launched {', '.join(launched)}\n")
+                    st.success(f"Launched {len(launched)} instance(s).")
+                    ec2_inventory.clear()
+
+                to_terminate = st.multiselect("Instances to terminate:", [f"{r['region']}/{r['instance_id']}" for r in visible], key="ec2_terminate")
+                extra_ids = st.text_input(f"Additional instance IDs in {default_region} (comma-separated):", key="ec2_terminate_extra")
+                if st.button("Terminate Instances", type="primary"):
+                    by_region = {}
+                    for item in to_terminate:
+                        region, instance_id = item.split("/", 1)
+                        by_region.setdefault(region, []).append(instance_id)
+                    by_region.setdefault(default_region, []).extend(i.strip() for i in extra_ids.split(",") if i.strip())
+                    by_region = {region: ids for region, ids in by_region.items() if ids}
+                    if by_region:
+                        for region, ids in by_region.items():
+                            st.warning(f"Sending termination request for {', '.join(ids)} in {region}...")
+                            client = clients.get(region) or ec2_client(domain.boto3, access_key, secret_key, region)
+                            response = client.terminate_instances(InstanceIds=ids)
+                            changes = ", ".join(f"{i['InstanceId']}: {i['PreviousState']['Name']} -> {i['CurrentState']['Name']}"
+                                                for i in response["TerminatingInstances"])
+                            st.session_state.terminal_log.write(f"\n\n[boto3] terminate_instances {region}: {changes}\n")
+                        ec2_inventory.clear()
                     else:
-                        st.error("Please provide an instance ID.")
-            except (NoCredentialsError, PartialCredentialsError, ClientError) as e:
+                        st.error("Please select or enter at least one instance ID.")
+            except (domain.botocore_exceptions.NoCredentialsError, domain.botocore_exceptions.PartialCredentialsError, domain.botocore_exceptions.ClientError) as e:
                 st.error(f"AWS Error: {e}. Check your secrets.toml and IAM permissions.")
 
     elif choice == "Docker CLI":
         st.subheader("Manage Docker Resources")
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("List All Containers"): run_command("docker ps -a")
-        with c2:
-            if st.button("List All Images"): run_command("docker images")
-        
-        with st.expander("Pull Image"):
-            img_to_pull = st.text_input("Image Name (e.g., ubuntu:latest):")
-            if st.button("Pull Image"):
-                if img_to_pull: run_command(f"docker pull {img_to_pull}")
-
-        with st.expander("Stop Container"):
-            container_to_stop = st.text_input("Container ID or Name:")
-            if st.button("Stop Container"):
-                if container_to_stop: run_command(f"docker stop {container_to_stop}")
-
-        with st.expander("Remove Container / Image"):
-            c1, c2 = st.columns(2)
-            id_to_remove = c1.text_input("Resource ID or Name to Remove:")
-            resource_type = c2.radio("Type:", ("Container", "Image"))
-            if st.button("Remove Resource", type="primary"):
-                if id_to_remove:
-                    cmd = "docker rm" if resource_type == "Container" else "docker rmi"
-                    run_command(f"{cmd} {id_to_remove}")
+        try:
+            engine = docker_engine(domain.docker)
+            containers = engine.containers()
+            images = engine.images()
+        except (OSError, domain.docker.DockerEngineError) as e:
+            st.error(f"Cannot reach the Docker Engine API at {domain.docker.DockerEngine().socket_path}. Is Docker running? Error: {e}")
+            containers = images = None
+        runner = st.session_state.command_runner
+        parallelism = st.slider("Parallel operations:", 1, 16, 4, key="docker_parallelism")
+
+        if containers is not None:
+            with st.expander(f"Containers ({len(containers)})", expanded=True):
+                container_filter = st.text_input("Filter containers:", key="docker_container_filter").lower()
+                visible = [c for c in containers if not container_filter or any(container_filter in str(v).lower() for v in c.values())]
+                st.dataframe(visible, use_container_width=True, hide_index=True)
+                selected = st.multiselect("Selected containers:", [c["name"] or c["id"] for c in visible], key="docker_selected_containers")
+                c1, c2, c3 = st.columns(3)
+                if c1.button("Stop Selected", disabled=not selected):
+                    runner.submit_task(f"docker stop {' '.join(selected)} (Engine API)",
+                                       lambda emit, items=list(selected): domain.docker.run_docker_batch(engine.stop, items, emit, parallelism))
+                force_remove = c3.checkbox("Force (kill running containers)", value=False, key="docker_force_remove")
+                if c2.button("Remove Selected", type="primary", disabled=not selected):
+                    runner.submit_task(f"docker rm{' -f' if force_remove else ''} {' '.join(selected)} (Engine API)",
+                                       lambda emit, items=list(selected), force=force_remove:
+                                           domain.docker.run_docker_batch(lambda c: engine.remove_container(c, force=force), items, emit, parallelism))
+
+            with st.expander(f"Images ({len(images)})"):
+                image_filter = st.text_input("Filter images:", key="docker_image_filter").lower()
+                visible_images = [i for i in images if not image_filter or any(image_filter in str(v).lower() for v in i.values())]
+                st.dataframe(visible_images, use_container_width=True, hide_index=True)
+                selected_images = st.multiselect("Selected images:", [i["id"] for i in visible_images], key="docker_selected_images",
+                                                 format_func=lambda image_id: next(f"{i['tags']} ({image_id})" for i in images if i["id"] == image_id))
+                if st.button("Remove Selected Images", type="primary", disabled=not selected_images):
+                    runner.submit_task(f"docker rmi {' '.join(selected_images)} (Engine API)",
+                                       lambda emit, items=list(selected_images): domain.docker.run_docker_batch(engine.remove_image, items, emit, parallelism))
+
+            with st.expander("Pull Images"):
+                imgs_to_pull = st.text_area("Image names, one per line (e.g., ubuntu:latest):", key="docker_pull")
+                pull_list = [i.strip() for i in imgs_to_pull.splitlines() if i.strip()]
+                if st.button("Pull Images") and pull_list:
+                    runner.submit_task(f"docker pull {' '.join(pull_list)} (Engine API)",
+                                       lambda emit, items=pull_list: domain.docker.run_docker_batch(lambda image: engine.pull(image, emit), items, emit, parallelism))
+
+            with st.expander("Live Container Stats"):
+                running = [c["name"] or c["id"] for c in containers if c["state"] == "running"]
+                watched = st.multiselect("Containers to watch:", running, default=running[:10])
+
+                def render_container_stats():
+                    collector = container_stats_collector(domain.docker)
+                    collector.watch(engine, watched)
+                    rows = collector.latest(watched)
+                    if rows:
+                        st.dataframe(rows, use_container_width=True, hide_index=True)
+                    elif watched:
+                        st.caption("Waiting for the first stats samples...")
+
+                st.fragment(render_container_stats, run_every=2 if watched else None)()
 
     elif choice == "Kubernetes":
         with st.expander("Manage Kubernetes Cluster", expanded=True):
-            st.info("Ensure `kubectl` is configured for your cluster (e.g., `minikube start`)", icon="ℹ️")
-            if st.button("Watch all pods in cluster"):
-                run_command("kubectl get pods --all-namespaces")
-            
-            pod_name = st.text_input("Pod Name", "nginx-pod")
-            pod_image = st.text_input("Pod Image", "nginx")
-            if st.button("Launch Pod"):
-                run_command(f"kubectl run {pod_name} --image={pod_image}")
+            st.info("Uses your kubeconfig, the same one `kubectl` uses (e.g., after `minikube start`)", icon="ℹ️")
+            try:
+                informer = pod_informer(domain.k8s, domain.k8s_client, domain.k8s_config, domain.k8s_watch)
+            except Exception as e:
+                st.error(f"Could not load a Kubernetes configuration. Error: {e}")
+                informer = None
+
+            if informer is not None:
+                f1, f2, f3 = st.columns(3)
+                all_pods = informer.pods()
+                namespace = f1.selectbox("Namespace:", ["All"] + sorted({p["namespace"] for p in all_pods}), key="k8s_namespace")
+                label_selector = f2.text_input("Label selector (e.g. app=web):", key="k8s_labels")
+                phase = f3.selectbox("Phase:", ["All", "Pending", "Running", "Succeeded", "Failed", "Unknown"], key="k8s_phase")
+
+                def render_pods():
+                    if informer.error:
+                        st.error(f"Pod watch failed, retrying. Error: {informer.error}")
+                    if not informer.synced:
+                        st.caption("Syncing pod cache...")
+                        return
+                    try:
+                        requirements = domain.k8s.parse_label_selector(label_selector)
+                    except ValueError as e:
+                        st.error(str(e))
+                        return
+                    pods = informer.pods(None if namespace == "All" else namespace, requirements, None if phase == "All" else phase)
+                    st.dataframe([{**p, "labels": ", ".join(f"{k}={v}" for k, v in p["labels"].items())} for p in pods],
+                                 use_container_width=True, hide_index=True)
+                    last_event = informer.stats["last_event"]
+                    st.caption(f"{len(pods)} of {len(informer.pods())} pods · {informer.stats['lists']} list(s), "
+                               f"{informer.stats['events']} watch events"
+                               + (f" · last event {time.time() - last_event:.0f}s ago" if last_event else ""))
+
+                st.fragment(render_pods, run_every=2)()
+
+                c1, c2 = st.columns(2)
+                pod_name = c1.text_input("Pod Name", "nginx-pod")
+                pod_image = c2.text_input("Pod Image", "nginx")
+                c1, c2 = st.columns(2)
+                pod_namespace = c1.text_input("Pod Namespace", "default")
+                replicas = c2.number_input("Replicas", min_value=1, max_value=100, value=1)
+                if st.button("Launch Pod"):
+                    core_api = informer.core_api
+                    st.session_state.command_runner.submit_task(
+                        f"create pod {pod_name} x{replicas} --image={pod_image} -n {pod_namespace} (Kubernetes API)",
+                        lambda emit: domain.k8s.create_pods(core_api, pod_namespace, pod_name, pod_image, replicas, emit))
     
     elif choice == "Terraform":
         with st.expander("Manage Infrastructure with Terraform", expanded=True):
-            st.info("Uses the `terraform_aws_ec2.tf` file in this project directory.", icon="ℹ️")
-            if st.button("Terraform Init"):
-                run_command('terraform init')
-            if st.button("Terraform Apply"):
-                run_command(f'terraform apply -auto-approve -var="aws_access_key={st.secrets["AWS_ACCESS_KEY_ID"]}" -var="aws_secret_key={st.secrets["AWS_SECRET_ACCESS_KEY"]}"')
-            if st.button("Terraform Destroy", type="primary"):
-                run_command(f'terraform destroy -auto-approve -var="aws_access_key={st.secrets["AWS_ACCESS_KEY_ID"]}" -var="aws_secret_key={st.secrets["AWS_SECRET_ACCESS_KEY"]}"')
+            st.info("Uses the `terraform_aws_ec2.tf` file in this project directory. Operations run as background jobs; only one runs at a time in this workspace.", icon="ℹ️")
+            scheduler = job_scheduler(domain.jobs)
+            workspace = f"terraform:{os.path.abspath('.')}"
+            tf_env = domain.terraform.terraform_env()
+
+            def aws_env():
+                """tf_env plus AWS credentials for jobs that call the provider, or None with a warning."""
+                credentials = terraform_credentials()
+                if credentials is None:
+                    st.warning("Set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY in secrets.toml to plan, apply or destroy.")
+                    return None
+                return {**tf_env, **credentials}
+
+            c1, c2 = st.columns(2)
+            parallelism = c1.number_input("-parallelism", min_value=1, max_value=64, value=10, key="tf_parallelism")
+            refresh = c2.checkbox("Refresh state before planning", value=True, key="tf_refresh")
+            plan_options = {"parallelism": parallelism, "refresh": refresh}
+            st.caption(f"Provider cache: `{tf_env.get('TF_PLUGIN_CACHE_DIR', 'unavailable')}` · mirror: "
+                       + (f"`{domain.terraform.terraform_mirror_dir()}`" if "TF_CLI_CONFIG_FILE" in tf_env else "none (downloads from the registry)"))
+
+            c1, c2, c3, c4 = st.columns(4)
+            if c1.button("Terraform Init"):
+                scheduler.submit("terraform init", "terraform init -input=false", workspace, env=tf_env)
+            if c2.button("Terraform Plan"):
+                if domain.terraform.saved_plan_is_current(options=plan_options):
+                    st.success("Configuration and state are unchanged since the saved plan; re-planning skipped.")
+                elif (env := aws_env()) is not None:
+                    fingerprint = domain.terraform.terraform_fingerprint()
+                    scheduler.submit("terraform plan",
+                                     f"terraform plan -input=false -parallelism={parallelism} -refresh={str(refresh).lower()} -out={domain.terraform.TF_PLAN_FILE}",
+                                     workspace, env=env,
+                                     on_success=lambda job: domain.terraform.record_saved_plan(fingerprint, plan_options))
+            if c3.button("Apply Saved Plan"):
+                if not os.path.exists(domain.terraform.TF_PLAN_FILE):
+                    st.warning("No saved plan yet. Run Terraform Plan first.")
+                elif not domain.terraform.saved_plan_is_current():
+                    # Terraform itself only rejects a saved plan when the state changed, not the configuration.
+                    st.warning("The configuration or state changed since the saved plan. Run Terraform Plan again before applying.")
+                elif (env := aws_env()) is not None:
+                    scheduler.submit("terraform apply", f"terraform apply -input=false -parallelism={parallelism} {domain.terraform.TF_PLAN_FILE}",
+                                     workspace, env=env, on_success=lambda job: remove_quietly(domain.terraform.TF_PLAN_META))
+            if c4.button("Terraform Destroy", type="primary") and (env := aws_env()) is not None:
+                scheduler.submit("terraform destroy", f"terraform destroy -auto-approve -input=false -parallelism={parallelism}",
+                                 workspace, env=env)
+            if st.button("Populate Provider Mirror"):
+                scheduler.submit("terraform mirror", f'terraform providers mirror "{domain.terraform.terraform_mirror_dir()}"', workspace, env=tf_env)
+
+            timings = domain.terraform.terraform_phase_timings(scheduler.jobs(limit=None))
+            if timings:
+                st.write("**Phase timings (successful runs)**")
+                st.dataframe(timings, use_container_width=True, hide_index=True)
+        render_jobs_panel(job_scheduler(domain.jobs))
 
     elif choice == "Ansible":
          with st.expander("Run Ansible Tasks", expanded=True):
              st.info("Uses the `inventory.ini` and `playbook.yml` files in this project directory.", icon="ℹ️")
              if st.button("List Inventory Hosts"):
                  run_command("ansible-inventory -i inventory.ini --list")
+             scheduler = job_scheduler(domain.jobs)
              if st.button("Run Example Playbook"):
-                 run_command("ansible-playbook -i inventory.ini playbook.yml")
+                 # Holds every host's key, so it never overlaps a per-host run against the same hosts.
+                 scheduler.submit("ansible-playbook playbook.yml", "ansible-playbook -i inventory.ini playbook.yml",
+                                  [f"ansible:{host}" for host in domain.jobs.inventory_hosts("inventory.ini")] or "ansible:inventory.ini")
+             c1, c2 = st.columns(2)
+             fanout_parallelism = c1.number_input("Hosts in parallel:", min_value=1, max_value=64, value=4, key="ansible_parallelism")
+             if c2.button("Run Playbook per Host"):
+                 group = f"fanout-{uuid.uuid4().hex[:6]}"
+                 for host in domain.jobs.inventory_hosts("inventory.ini"):
+                     scheduler.submit(f"ansible-playbook playbook.yml --limit {host}",
+                                      f"ansible-playbook -i inventory.ini playbook.yml --limit {host}",
+                                      f"ansible:{host}", group=group, group_limit=fanout_parallelism)
+         render_jobs_panel(job_scheduler(domain.jobs))
 
     elif choice == "Jenkins":
         with st.expander("Launch Jenkins Server", expanded=True):
@@ -342,86 +767,177 @@ with col1:
             if st.button("Launch Jenkins in Docker"):
                  st.warning("Jenkins is starting... this may take a minute.")
                  run_command(f"docker run -d -p {jenkins_port}:8080 -p 50000:50000 --name jenkins-server --rm jenkins/jenkins:lts-jdk11")
-                 st.success(f"Jenkins launched! Access at http://localhost:{jenkins_port}")
+                 st.success(f"Jenkins launch queued. Once it is up, access it at http://localhost:{jenkins_port}. Progress is in the terminal.")
                  st.info("The container is named 'jenkins-server'. Use the button below to get the password once it has started.")
         
         with st.expander("Get Jenkins Admin Password"):
             st.info("Click this ONLY after the Jenkins container is fully running.", icon="ℹ️")
             if st.button("Get Initial Password"):
                 command = "docker exec jenkins-server cat /var/jenkins_home/secrets/initialAdminPassword"
-                st.session_state.terminal_output += f"\n\n$ {command}\nAttempting to retrieve Jenkins admin password...\n"
+                st.session_state.terminal_log.write(f"\n\n$ {command}\nAttempting to retrieve Jenkins admin password...\n")
                 try:
                     result = subprocess.run(
                         command, shell=True, check=True, capture_output=True, text=True
                     )
                     st.success("Password retrieved! See terminal for details.")
                     st.code(result.stdout, language='text')
-                    st.session_state.terminal_output += f"\n--- Jenkins Initial Admin Password ---\n{result.stdout}\n"
+                    st.session_state.terminal_log.write(f"\n--- Jenkins Initial Admin Password ---\n{result.stdout}\n")
                 except subprocess.CalledProcessError as e:
                     st.error("Failed to get password. Is the 'jenkins-server' container running and fully initialized?")
-                    st.session_state.terminal_output += f"Error retrieving password: {e.stderr}\n"
+                    st.session_state.terminal_log.write(f"Error retrieving password: {e.stderr}\n")
 
     elif choice == "Generative AI":
         st.info("Requires Google Gemini API Key configured in secrets.toml", icon="🔑")
+        def build_gemini_model(api_key):
+            domain.genai.configure(api_key=api_key)
+            return domain.genai.GenerativeModel('gemini-1.5-flash-latest')
+
+        model = None
         try:
-            genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+            gemini_key = st.secrets["GEMINI_API_KEY"]
+            model = resource_registry().get("gemini", (gemini_key,), lambda: build_gemini_model(gemini_key),
+                                            label="gemini-1.5-flash-latest")
         except Exception as e:
             st.error(f"Failed to configure Gemini AI. Check your secrets.toml file. Error: {e}")
 
         with st.expander("1. Voice Command to Terminal", expanded=True):
-            st.write("Click 'Start Listening', speak a command like *'list all docker containers'* or *'what is today's date'*, and the AI will translate it to a shell command.")
-            if st.button("Start Listening"):
-                r = sr.Recognizer()
-                with sr.Microphone() as source:
-                    st.warning("Listening... Speak clearly.")
-                    try:
-                        r.adjust_for_ambient_noise(source)
-                        audio = r.listen(source, timeout=5, phrase_time_limit=10)
+            st.write("Click 'Start Listening', speak a command like *'list all docker containers'* or *'what is today's date'*, and the AI will translate it to a shell command. You can also type the request or upload a recording.")
+            input_mode = st.radio("Input:", ["Microphone", "Typed text", "Uploaded audio"], horizontal=True, key="voice_input_mode")
+            cache = translation_cache(domain.translation)
+            try:
+                recognized_text = None
+                if input_mode == "Microphone":
+                    if st.button("Start Listening"):
+                        r = domain.sr.Recognizer()
+                        with domain.sr.Microphone() as source:
+                            st.warning("Listening... Speak clearly.")
+                            r.adjust_for_ambient_noise(source)
+                            audio = r.listen(source, timeout=5, phrase_time_limit=10)
                         st.info("Audio captured. Translating with AI...")
                         recognized_text = r.recognize_google(audio).lower()
-                        st.write(f"**You said:** *'{recognized_text}'*")
-                        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-                        prompt = f"You are an expert AI that translates human language into a single, executable Linux shell command. Your response MUST be ONLY the shell command itself, with no explanation or formatting. If you cannot determine a clear and safe command, respond with the exact string 'ERROR:UNCLEAR'.\nUser's request: '{recognized_text}'\nYour command:"
-                        response = model.generate_content(prompt)
-                        command_from_ai = response.text.strip()
-                        st.write(f"**AI translated command:** `{command_from_ai}`")
-                        if "ERROR:UNCLEAR" in command_from_ai:
-                            st.error("AI could not determine a safe or clear command from your speech.")
-                        else:
-                            run_command(command_from_ai)
-                            st.success("AI-generated command executed.")
-                    except sr.WaitTimeoutError: st.error("Listening timed out.")
-                    except sr.UnknownValueError: st.error("Could not understand the audio.")
-                    except Exception as e: st.error(f"An unexpected error occurred: {e}")
+                elif input_mode == "Typed text":
+                    typed_text = st.text_input("Request:", key="voice_typed_text")
+                    if st.button("Translate") and typed_text:
+                        recognized_text = typed_text
+                else:
+                    audio_file = st.file_uploader("Recording (WAV, AIFF or FLAC):", type=["wav", "aif", "aiff", "flac"], key="voice_audio_file")
+                    if st.button("Transcribe and Translate") and audio_file:
+                        r = domain.sr.Recognizer()
+                        with domain.sr.AudioFile(audio_file) as source:
+                            audio = r.record(source)
+                        recognized_text = r.recognize_google(audio).lower()
+
+                if recognized_text:
+                    st.write(f"**You said:** *'{recognized_text}'*")
+                    translated = st.empty()
+                    command_from_ai, cached = domain.translation.translate_command(
+                        cache, model, recognized_text,
+                        lambda partial: translated.write(f"**AI translated command:** `{partial}`"))
+                    translated.write(f"**AI translated command:** `{command_from_ai}`" + (" *(cached)*" if cached else ""))
+                    if "ERROR:UNCLEAR" in command_from_ai:
+                        st.error("AI could not determine a safe or clear command from your speech.")
+                    else:
+                        run_command(command_from_ai)
+                        st.success("AI-generated command queued. Output is in the terminal.")
+            except domain.sr.WaitTimeoutError: st.error("Listening timed out.")
+            except domain.sr.UnknownValueError: st.error("Could not understand the audio.")
+            except Exception as e: st.error(f"An unexpected error occurred: {e}")
+            st.caption(cache.summary())
 
     elif choice == "MongoDB Database":
          with st.expander("Manage Database Records", expanded=True):
             try:
-                client = pymongo.MongoClient("mongodb://localhost:27017/")
+                mongo_uri = "mongodb://localhost:27017/"
+                client = resource_registry().get(
+                    "mongodb", (mongo_uri,), label=mongo_uri,
+                    factory=lambda: domain.pymongo.MongoClient(mongo_uri, serverSelectionTimeoutMS=5000),
+                    health_check=lambda c: c.admin.command("ping")
+                )
                 db = client.devops_project_db
                 collection = db.user_records
+                ensure_record_indexes(domain.records, mongo_uri, collection)
                 with st.form("data_form", clear_on_submit=True):
                     name = st.text_input("User Name")
                     email = st.text_input("User Email")
                     if st.form_submit_button("Add Record"):
                         collection.insert_one({"name": name, "email": email, "timestamp": time.time()})
                         st.success("Record added to MongoDB!")
+
+                with st.form("import_form", clear_on_submit=True):
+                    uploaded = st.file_uploader("Bulk import (CSV with name,email columns or JSONL):", type=["csv", "jsonl"])
+                    if st.form_submit_button("Import Records") and uploaded:
+                        started = time.perf_counter()
+                        rejected = []
+                        count, refused = domain.records.import_records(collection, domain.records.read_uploaded_records(uploaded, rejected), domain.pymongo.errors)
+                        st.success(f"Imported {count} records in {time.perf_counter() - started:.2f}s.")
+                        if rejected or refused:
+                            details = "\n".join(f"- line {line}: {reason}" for line, reason in rejected[:10])
+                            st.warning(f"Skipped {len(rejected)} invalid row(s); the database refused {refused} record(s) "
+                                       f"(e.g. duplicate `_id`).\n\n{details}")
+
                 st.subheader("Stored Records")
-                records = list(collection.find({}, {"_id": 0}))
-                st.dataframe(records, use_container_width=True)
-            except pymongo.errors.ConnectionFailure as e:
+                f1, f2, f3 = st.columns([2, 2, 1])
+                name_prefix = f1.text_input("Name starts with:", key="records_name")
+                email_prefix = f2.text_input("Email starts with:", key="records_email")
+                page_size = f3.selectbox("Page size:", [25, 50, 100, 250], index=1, key="records_page_size")
+                # Each entry is the (timestamp, _id) the page starts after; None is the first page.
+                page_key = (name_prefix, email_prefix, page_size)
+                if st.session_state.get("records_page_key") != page_key:
+                    st.session_state.records_page_key = page_key
+                    st.session_state.records_pages = [None]
+                pages = st.session_state.records_pages
+
+                started = time.perf_counter()
+                records, has_next = domain.records.fetch_records_page(collection, name_prefix, email_prefix, pages[-1], page_size)
+                fetch_ms = (time.perf_counter() - started) * 1000
+                st.dataframe([{k: v for k, v in r.items() if k != "_id"} for r in records], use_container_width=True)
+                p1, p2, p3 = st.columns([1, 2, 1])
+                if p1.button("⬅ Previous", disabled=len(pages) == 1):
+                    pages.pop()
+                    st.rerun()
+                p2.caption(f"Page {len(pages)} · {len(records)} records · fetched in {fetch_ms:.1f} ms · "
+                           f"~{collection.estimated_document_count()} in collection")
+                if p3.button("Next ➡", disabled=not has_next):
+                    pages.append((records[-1]["timestamp"], records[-1]["_id"]))
+                    st.rerun()
+            except domain.pymongo.errors.ConnectionFailure as e:
                 st.error(f"MongoDB connection failed. Is it running? Error: {e}")
 
 # ==============================================================================
 # TERMINAL OUTPUT AREA (COLUMN 2)
 # ==============================================================================
-with col2:
+with col2, profiler.section("terminal"):
     c1, c2 = st.columns([3, 1])
     with c1:
         st.header("⚡ Live Terminal")
     with c2:
         if st.button("Clear 🗑️"):
-            st.session_state.terminal_output = "Terminal cleared.\n"
+            st.session_state.terminal_log.clear("Terminal cleared.\n")
+            st.rerun()
+
+    def render_terminal():
+        runner = st.session_state.command_runner
+        st.code(st.session_state.terminal_log.tail(), language='bash', line_numbers=False)
+        if runner.timings:
+            last = runner.timings[-1]
+            first_byte = f"{last['first_byte_s']:.2f}s" if last['first_byte_s'] is not None else "n/a"
+            st.caption(f"Last command: first byte {first_byte}, total {last['total_s']:.2f}s")
+        # Polling was switched on for a running command; once it has finished,
+        # rerun the whole app so the fragment stops refreshing.
+        if st.session_state.terminal_polling and not runner.busy:
             st.rerun()
 
-    st.code(st.session_state.terminal_output, language='bash', line_numbers=False)
+    st.session_state.terminal_polling = st.session_state.command_runner.busy
+    st.fragment(render_terminal, run_every=0.5 if st.session_state.terminal_polling else None)()
+
+    with st.expander("Terminal History"):
+        log = st.session_state.terminal_log
+        st.caption(f"{log.size / 1024:.1f} KB total, {log.memory_size / 1024:.1f} KB in memory, {log.spilled_size / 1024:.1f} KB on disk")
+        search_term = st.text_input("Search history:", key="terminal_search")
+        if search_term:
+            st.code(log.search(search_term) or "No matches.", language='bash', line_numbers=False)
+        else:
+            page = st.number_input(f"Page (1 = newest, {log.pages} total):", min_value=1, max_value=log.pages, value=1, key="terminal_page")
+            st.code(log.page(page), language='bash', line_numbers=False)
+
+profiler.finish(choice)
@@ -0,0 +1,243 @@
+"""Headless rerun benchmark for Yash-project-app.py.
+
+Drives the app through Streamlit's AppTest with every external backend stubbed
+out (see stubs.py). For each sidebar domain it records rerun latency
+percentiles and peak Python memory as the Live Terminal history grows. It then
+times a few button actions that exercise subprocess, boto3, SMTP and Gemini.
+
+Latencies are the script's own run time as reported by the app's
+RerunProfiler (DEVOPS_PROFILE), which the benchmark always switches on;
+wall_p50_ms adds AppTest's per-run overhead and is shown for reference.
+
+    python benchmarks/rerun_bench.py                        # all domains
+    python benchmarks/rerun_bench.py --domains Terraform --reruns 30
+    python benchmarks/rerun_bench.py --json after.json --baseline before.json
+
+With --baseline the script exits with status 1 if any p95 latency regressed by
+more than --max-regression. With --profile the slowest profiled sections per
+domain are reported as well.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import stubs  # noqa: E402
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Yash-project-app.py")
+DOMAINS = ["Python Automation", "JavaScript + Docker", "AWS Cloud Tasks",
+           "Docker CLI", "Kubernetes", "Terraform", "Ansible",
+           "Jenkins", "Generative AI", "MongoDB Database"]
+SECRETS = {"AWS_ACCESS_KEY_ID": "bench", "AWS_SECRET_ACCESS_KEY": "bench", "AWS_DEFAULT_REGION": "us-east-1",
+           "GEMINI_API_KEY": "bench", "SENDER_EMAIL": "bench@example.com", "SENDER_PASSWORD": "bench",
+           "SMTP_HOST": "localhost", "SMTP_STARTTLS": False}
+FILLER = "".join(f"[bench] line {i:03d} of simulated command output padded to width\n" for i in range(16))
+
+
+def prepare_email(at):
+    at.text_input(key="email_to").set_value("ops@example.com").run()
+    at.text_input(key="email_sub").set_value("benchmark").run()
+
+
+def prepare_translation(at):
+    at.radio(key="voice_input_mode").set_value("Typed text").run()
+    at.text_input(key="voice_typed_text").set_value("list files").run()
+
+
+# (domain, action name, prepare(at) or None, label of the button that is timed)
+ACTIONS = [
+    ("Python Automation", "queue email (SMTP)", prepare_email, "Send Email"),
+    ("AWS Cloud Tasks", "refresh inventory (boto3)", None, "Refresh Inventory"),
+    ("Terraform", "submit init job (subprocess)", None, "Terraform Init"),
+    ("Jenkins", "launch container (run_command)", None, "Launch Jenkins in Docker"),
+    ("Jenkins", "read admin password (subprocess.run)", None, "Get Initial Password"),
+    ("Generative AI", "translate request (Gemini)", prepare_translation, "Translate"),
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def open_session(domain, timeout):
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    for key, value in SECRETS.items():
+        at.secrets[key] = value
+    at.run()
+    at.sidebar.radio[0].set_value(domain).run()
+    return at
+
+
+def failure(at):
+    return at.exception[0].value if at.exception else None
+
+
+class ProfileLog:
+    """Reads the run records the app appends to DEVOPS_PROFILE_LOG."""
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.records = []
+
+    def new_records(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            f.seek(self.offset)
+            records = [json.loads(line) for line in f]
+            self.offset = f.tell()
+        self.records.extend(records)
+        return records
+
+
+def timed_run(run, profile_log):
+    """Runs the app once; returns its script time (wall time if the run was cut short) and wall time."""
+    profile_log.new_records()
+    started = time.perf_counter()
+    run()
+    wall_ms = (time.perf_counter() - started) * 1000
+    records = profile_log.new_records()
+    return (records[-1]["total_ms"] if records else wall_ms), wall_ms
+
+
+def peak_memory_kb(run):
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(timings, **fields):
+    latencies = [script_ms for script_ms, _ in timings]
+    return dict(fields, runs=len(latencies), p50_ms=round(percentile(latencies, 0.50), 1),
+                p95_ms=round(percentile(latencies, 0.95), 1), max_ms=round(max(latencies), 1),
+                wall_p50_ms=round(percentile([wall_ms for _, wall_ms in timings], 0.50), 1))
+
+
+def bench_domain(domain, history_kb, reruns, timeout, profile_log):
+    """Times plain reruns of one domain page at each terminal history size."""
+    at = open_session(domain, timeout)
+    if failure(at):
+        return [{"domain": domain, "error": failure(at)}]
+    results = []
+    log = at.session_state["terminal_log"]
+    for target_kb in history_kb:
+        while log.size < target_kb * 1024:
+            log.write(FILLER)
+        timings = [timed_run(at.run, profile_log) for _ in range(reruns)]
+        if failure(at):
+            return results + [{"domain": domain, "error": failure(at)}]
+        results.append(summarize(timings, domain=domain, history_kb=target_kb, log_bytes=log.size,
+                                 peak_kb=round(peak_memory_kb(at.run))))
+    return results
+
+
+def bench_action(domain, name, prepare, label, reruns, timeout, profile_log):
+    """Times the rerun triggered by clicking ``label``; the first click is the cold one."""
+    at = open_session(domain, timeout)
+    if prepare:
+        prepare(at)
+    timings = []
+    for _ in range(reruns):
+        button = next((b for b in at.button if b.label == label), None)
+        if button is None or failure(at):
+            return {"domain": domain, "action": name, "error": failure(at) or f"no button labelled {label!r}"}
+        timings.append(timed_run(button.click().run, profile_log))
+    return summarize(timings, domain=domain, action=name, cold_ms=round(timings[0][0], 1))
+
+
+def profile_summary(records, top=5):
+    """Median time of the slowest profiled sections per domain."""
+    sections = {}
+    for record in records:
+        for s in record["sections"]:
+            sections.setdefault(record["choice"], {}).setdefault(s["section"], []).append(s["ms"])
+    return {domain: sorted(({"section": name, "p50_ms": percentile(times, 0.5), "runs": len(times)}
+                            for name, times in by_name.items()), key=lambda s: -s["p50_ms"])[:top]
+            for domain, by_name in sections.items()}
+
+
+def regressions(results, baseline, max_regression, floor_ms=5.0):
+    """Entries whose p95 grew by more than ``max_regression`` (and at least ``floor_ms``) over the baseline."""
+    def key(r):
+        return (r["domain"], r.get("history_kb"), r.get("action"))
+
+    before = {key(r): r for r in baseline["reruns"] + baseline["actions"] if "p95_ms" in r}
+    found = []
+    for r in results["reruns"] + results["actions"]:
+        old = before.get(key(r))
+        if old and "p95_ms" in r and r["p95_ms"] > old["p95_ms"] * (1 + max_regression) and r["p95_ms"] - old["p95_ms"] > floor_ms:
+            found.append((key(r), old["p95_ms"], r["p95_ms"]))
+    return found
+
+
+def print_table(rows, columns):
+    widths = {c: max([len(c)] + [len(str(r.get(c, ""))) for r in rows]) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--domains", nargs="+", default=DOMAINS, choices=DOMAINS)
+    parser.add_argument("--reruns", type=int, default=10, help="timed reruns per measurement")
+    parser.add_argument("--history-kb", default="0,256,2048", help="terminal history sizes to measure at, in KB")
+    parser.add_argument("--instances", type=int, default=50, help="EC2 instances per region in the boto3 stub")
+    parser.add_argument("--records", type=int, default=500, help="documents in the pymongo stub")
+    parser.add_argument("--containers", type=int, default=20, help="containers in the fake Docker Engine API")
+    parser.add_argument("--pods", type=int, default=200, help="pods in the kubernetes stub")
+    parser.add_argument("--timeout", type=float, default=30, help="AppTest timeout per run, in seconds")
+    parser.add_argument("--profile", action="store_true", help="also report the slowest profiled sections per domain")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95 growth over the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    output, baseline = (os.path.abspath(p) if p else None for p in (args.json, args.baseline))
+    stubs.install(instances=args.instances, records=args.records, containers=args.containers, pods=args.pods)
+    # Jobs, caches and crawled files the app writes go to a scratch directory.
+    os.chdir(tempfile.mkdtemp(prefix="rerun-bench-"))
+    profile_log = ProfileLog(os.path.abspath("profile.jsonl"))
+    os.environ.update(DEVOPS_PROFILE="1", DEVOPS_PROFILE_LOG=profile_log.path)
+
+    history_kb = [int(kb) for kb in args.history_kb.split(",")]
+    results = {"reruns": [], "actions": []}
+    for domain in args.domains:
+        print(f"benchmarking {domain} ...", file=sys.stderr)
+        results["reruns"].extend(bench_domain(domain, history_kb, args.reruns, args.timeout, profile_log))
+    for domain, name, prepare, label in ACTIONS:
+        if domain in args.domains:
+            results["actions"].append(bench_action(domain, name, prepare, label, args.reruns, args.timeout, profile_log))
+    if args.profile:
+        results["profile"] = profile_summary(profile_log.records)
+
+    print_table(results["reruns"], ["domain", "history_kb", "log_bytes", "runs", "p50_ms", "p95_ms", "max_ms", "wall_p50_ms", "peak_kb", "error"])
+    print()
+    print_table(results["actions"], ["domain", "action", "runs", "cold_ms", "p50_ms", "p95_ms", "max_ms", "wall_p50_ms", "error"])
+    for domain, sections in results.get("profile", {}).items():
+        print(f"\n{domain}: " + ", ".join(f"{s['section']} {s['p50_ms']:.1f} ms" for s in sections))
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    if baseline:
+        with open(baseline) as f:
+            found = regressions(results, json.load(f), args.max_regression)
+        for key, old, new in found:
+            print(f"REGRESSION {key}: p95 {old:.1f} ms -> {new:.1f} ms", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""Offline stand-ins for the backends Yash-project-app.py talks to.
+
+install() swaps them in for the whole process: subprocess.Popen and
+subprocess.run, smtplib.SMTP, and the boto3, botocore.exceptions, pymongo,
+kubernetes, google.generativeai and speech_recognition modules the app imports
+lazily. The app builds its own Docker Engine API client, so install() instead
+serves a fake Engine API on a temporary unix socket and points DOCKER_HOST at
+it. Every stub answers instantly with canned data, so benchmark numbers measure
+the app itself rather than the network or the machine's installed tools.
+"""
+import io
+import json
+import os
+import socketserver
+import subprocess
+import smtplib
+import sys
+import tempfile
+import threading
+import time
+import types
+import uuid
+from http.server import BaseHTTPRequestHandler
+from datetime import datetime, timezone
+
+_real_popen, _real_run = subprocess.Popen, subprocess.run
+
+
+class FakePopen:
+    """Finishes immediately after printing ``lines`` lines of output.
+
+    Only the app's shell commands are faked; anything else (e.g. ctypes
+    probing ldconfig while a library imports) gets a real process.
+    """
+    lines = 20
+
+    def __new__(cls, args, *posargs, shell=False, **kwargs):
+        if not shell:
+            return _real_popen(args, *posargs, **kwargs)
+        return super().__new__(cls)
+
+    def __init__(self, args, stdout=None, stderr=None, **kwargs):
+        self.args = args
+        self.pid = 0
+        self.returncode = None
+        output = "".join(f"[stub] {args} ({i})\n" for i in range(self.lines))
+        self.stdout = io.StringIO(output) if stdout == subprocess.PIPE else None
+        self.stderr = io.StringIO("") if stderr == subprocess.PIPE else None
+        if hasattr(stdout, "write"):
+            stdout.write(output.encode() if "b" in getattr(stdout, "mode", "") else output)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self.returncode = 0
+        return 0
+
+    def communicate(self, input=None, timeout=None):
+        self.wait()
+        return (self.stdout.read() if self.stdout else None, self.stderr.read() if self.stderr else None)
+
+    def send_signal(self, sig):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wait()
+
+    terminate = kill = lambda self: None
+
+
+def fake_run(args, *posargs, shell=False, **kwargs):
+    if not shell:
+        return _real_run(args, *posargs, **kwargs)
+    return subprocess.CompletedProcess(args, 0, stdout=f"[stub] {args}\n", stderr="")
+
+
+class FakeSMTP:
+    """Advertises STARTTLS and AUTH after EHLO, and forgets them on STARTTLS like a real server."""
+    def __init__(self, host="", port=0, timeout=None, **kwargs):
+        self.sent = 0
+        self.esmtp_features = {}
+
+    def ehlo(self, name=""):
+        self.esmtp_features = {"starttls": "", "auth": "LOGIN PLAIN"}
+        return (250, b"ok")
+
+    def starttls(self, *args, **kwargs):
+        self.esmtp_features = {}
+        return (220, b"ready")
+
+    def has_extn(self, name):
+        return name.lower() in self.esmtp_features
+
+    def login(self, user, password):
+        return (235, b"ok")
+
+    def send_message(self, message, *args, **kwargs):
+        self.sent += 1
+        return {}
+
+    def sendmail(self, *args, **kwargs):
+        self.sent += 1
+        return {}
+
+    def noop(self):
+        return (250, b"ok")
+
+    def quit(self):
+        return (221, b"bye")
+
+    close = lambda self: None
+
+
+# --- boto3 ---
+class FakeClientError(Exception):
+    pass
+
+
+class FakeBotoCoreError(Exception):
+    pass
+
+
+class FakeEC2:
+    def __init__(self, region, instances):
+        launched = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.instances = [{
+            "InstanceId": f"i-{region.replace('-', '')}{n:06d}", "InstanceType": "t2.micro",
+            "State": {"Name": "terminated" if n % 10 == 0 else "running"},
+            "Placement": {"AvailabilityZone": f"{region}a"}, "LaunchTime": launched,
+            "PrivateIpAddress": f"10.0.{n // 256}.{n % 256}", "Tags": [{"Key": "Name", "Value": f"bench-{n}"}],
+        } for n in range(instances)]
+
+    def get_paginator(self, operation):
+        instances = self.instances
+        return types.SimpleNamespace(paginate=lambda **kwargs: (
+            {"Reservations": [{"Instances": instances[i:i + 100]}]} for i in range(0, max(len(instances), 1), 100)))
+
+    def run_instances(self, MinCount=1, **kwargs):
+        return {"Instances": [{"InstanceId": f"i-{uuid.uuid4().hex[:17]}"} for _ in range(MinCount)]}
+
+    def terminate_instances(self, InstanceIds):
+        return {"TerminatingInstances": [{"InstanceId": i, "PreviousState": {"Name": "running"},
+                                          "CurrentState": {"Name": "shutting-down"}} for i in InstanceIds]}
+
+
+# --- pymongo ---
+class FakeCursor:
+    def __init__(self, records):
+        self.records = records
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def limit(self, n):
+        return FakeCursor(self.records[:n])
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+class FakeCollection:
+    """Ignores filters: every query returns the newest records first."""
+    def __init__(self, records):
+        now = time.time()
+        self.records = [{"_id": n, "name": f"user{n}", "email": f"user{n}@example.com", "timestamp": now - n}
+                        for n in range(records)]
+
+    def create_index(self, *args, **kwargs):
+        return "index"
+
+    def find(self, query=None, projection=None):
+        return FakeCursor(self.records)
+
+    def insert_one(self, record):
+        self.records.insert(0, dict(record, _id=uuid.uuid4().hex))
+        return types.SimpleNamespace(inserted_id=self.records[0]["_id"])
+
+    def insert_many(self, records, ordered=True):
+        return types.SimpleNamespace(inserted_ids=[self.insert_one(r).inserted_id for r in records])
+
+    def estimated_document_count(self):
+        return len(self.records)
+
+
+class FakeMongoClient:
+    collections = {}
+    records = 500
+
+    def __init__(self, uri=None, **kwargs):
+        self.admin = types.SimpleNamespace(command=lambda name: {"ok": 1.0})
+
+    def __getattr__(self, name):
+        return types.SimpleNamespace(user_records=self.collections.setdefault(name, FakeCollection(self.records)))
+
+    def close(self):
+        pass
+
+
+# --- Docker Engine API ---
+class FakeDockerEngine(BaseHTTPRequestHandler):
+    """Answers the Engine API endpoints DockerEngine calls with canned data."""
+    protocol_version = "HTTP/1.1"
+    containers = 20
+    images = 10
+
+    def log_message(self, *args):
+        pass
+
+    def address_string(self):
+        return "docker.sock"
+
+    def send_json(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, events, interval=0.0):
+        """Sends ``events`` as a chunked, newline-delimited JSON stream."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in events:
+                data = (json.dumps(event) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+                time.sleep(interval)
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass  # the client stopped following the stream
+        self.close_connection = True
+
+    def discard_body(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/_ping":
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"OK")
+        elif path == "/containers/json":
+            self.send_json([{
+                "Id": f"{n:064x}", "Names": [f"/bench-{n}"], "Image": "nginx:latest",
+                "State": "exited" if n % 5 == 0 else "running", "Status": "Up 2 hours",
+                "Ports": [{"PrivatePort": 80, "PublicPort": 8000 + n, "Type": "tcp"}],
+            } for n in range(self.containers)])
+        elif path == "/images/json":
+            self.send_json([{"Id": f"sha256:{n:064x}", "RepoTags": [f"bench/image-{n}:latest"],
+                             "Size": 100e6 + n, "Created": 1704067200} for n in range(self.images)])
+        elif path.startswith("/images/") and path.endswith("/json"):
+            self.send_json({"Id": f"sha256:{0:064x}"})
+        elif path.endswith("/stats"):
+            self.send_stream(({
+                "cpu_stats": {"cpu_usage": {"total_usage": 2e7 * n}, "system_cpu_usage": 1e9 * n, "online_cpus": 2},
+                "precpu_stats": {"cpu_usage": {"total_usage": 2e7 * (n - 1)}, "system_cpu_usage": 1e9 * (n - 1)},
+                "memory_stats": {"usage": 50e6, "limit": 1e9, "stats": {"inactive_file": 10e6}},
+                "networks": {"eth0": {"rx_bytes": 1e6 * n, "tx_bytes": 2e6 * n}},
+            } for n in range(1, 3600)), interval=1.0)
+        else:
+            self.send_json({"message": f"no such endpoint: {path}"}, 404)
+
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        self.discard_body()
+        if path == "/images/create":
+            self.send_stream([{"status": "Pulling from bench/image", "id": "latest"},
+                              {"status": "Pull complete", "id": "layer"}])
+        elif path == "/build":
+            self.send_stream([{"stream": "Step 1/1 : FROM bench\n"}, {"stream": "Successfully built\n"}])
+        elif path == "/containers/create":
+            self.send_json({"Id": uuid.uuid4().hex}, 201)
+        else:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def do_DELETE(self):
+        self.send_json([], 200)
+
+
+def serve_docker_engine():
+    """Serves FakeDockerEngine on a temporary unix socket; returns the socket path."""
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="fake-docker-"), "docker.sock")
+    server = socketserver.ThreadingUnixStreamServer(socket_path, FakeDockerEngine)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return socket_path
+
+
+# --- kubernetes ---
+class FakeConfigException(Exception):
+    pass
+
+
+def fake_pod(n, namespace):
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return types.SimpleNamespace(
+        metadata=types.SimpleNamespace(uid=f"pod-{n}", name=f"bench-{n}", namespace=namespace,
+                                       labels={"app": f"web-{n % 4}", "tier": "bench"}, resource_version=str(n)),
+        spec=types.SimpleNamespace(containers=[object()], node_name=f"node-{n % 3}"),
+        status=types.SimpleNamespace(phase="Pending" if n % 10 == 0 else "Running", pod_ip=f"10.1.{n // 256}.{n % 256}",
+                                     start_time=started, container_statuses=[types.SimpleNamespace(ready=n % 10 != 0, restart_count=n % 3)]),
+    )
+
+
+class FakeCoreV1Api:
+    pods = 200
+
+    def __init__(self, api_client=None):
+        self.api_client = api_client
+
+    def list_pod_for_all_namespaces(self, **kwargs):
+        return types.SimpleNamespace(items=[fake_pod(n, ("default", "kube-system", "bench")[n % 3]) for n in range(self.pods)],
+                                     metadata=types.SimpleNamespace(resource_version=str(self.pods)))
+
+    def create_namespaced_pod(self, namespace, body):
+        return body
+
+
+class FakeWatch:
+    """A watch on a quiet cluster: no events until the server-side timeout."""
+    def __init__(self):
+        self._stopped = threading.Event()
+
+    def stream(self, func, resource_version=None, timeout_seconds=300, **kwargs):
+        self._stopped.wait(timeout_seconds)
+        return iter(())
+
+    def stop(self):
+        self._stopped.set()
+
+
+# --- Gemini and speech recognition ---
+class FakeGenerativeModel:
+    def __init__(self, name):
+        self.name = name
+
+    def generate_content(self, prompt, stream=False):
+        chunks = [types.SimpleNamespace(text=t) for t in ("echo ", "benchmark")]
+        return iter(chunks) if stream else types.SimpleNamespace(text="echo benchmark")
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def install(instances=50, records=500, output_lines=20, containers=20, pods=200):
+    """Replaces every external backend with an instant, in-memory stub."""
+    FakePopen.lines = output_lines
+    FakeMongoClient.records = records
+    FakeMongoClient.collections = {}
+    FakeDockerEngine.containers = containers
+    FakeCoreV1Api.pods = pods
+    subprocess.Popen = FakePopen
+    subprocess.run = fake_run
+    smtplib.SMTP = FakeSMTP
+    os.environ["DOCKER_HOST"] = f"unix://{serve_docker_engine()}"
+
+    botocore_exceptions = _module("botocore.exceptions", ClientError=FakeClientError, BotoCoreError=FakeBotoCoreError,
+                                  NoCredentialsError=type("NoCredentialsError", (Exception,), {}),
+                                  PartialCredentialsError=type("PartialCredentialsError", (Exception,), {}))
+    sr_errors = {name: type(name, (Exception,), {}) for name in ("WaitTimeoutError", "UnknownValueError", "RequestError")}
+    sys.modules.update({
+        "boto3": _module("boto3", client=lambda service, region_name=None, **kwargs: FakeEC2(region_name or "us-east-1", instances)),
+        "botocore.exceptions": botocore_exceptions,
+        "pymongo": _module("pymongo", MongoClient=FakeMongoClient,
+                           errors=_module("pymongo.errors", ConnectionFailure=type("ConnectionFailure", (Exception,), {}),
+                                          BulkWriteError=type("BulkWriteError", (Exception,), {}))),
+        "kubernetes": _module("kubernetes"),
+        "kubernetes.client": _module("kubernetes.client", ApiClient=lambda *args, **kwargs: object(), CoreV1Api=FakeCoreV1Api),
+        "kubernetes.config": _module("kubernetes.config", ConfigException=FakeConfigException,
+                                     new_client_from_config=lambda *args, **kwargs: object(),
+                                     load_incluster_config=lambda: None),
+        "kubernetes.watch": _module("kubernetes.watch", Watch=FakeWatch),
+        "google.generativeai": _module("google.generativeai", configure=lambda **kwargs: None,
+                                       GenerativeModel=FakeGenerativeModel),
+        "speech_recognition": _module("speech_recognition", Recognizer=object, Microphone=object, AudioFile=object, **sr_errors),
+    })
@@ -0,0 +1,7 @@
+"""Backends of the control center's sidebar domains.
+
+Streamlit re-executes Yash-project-app.py on every rerun and fragment tick, so
+the classes and helpers behind each domain live here instead: each module is
+imported once per process, by load_domain when its domain is first opened.
+runtime holds what every page needs and is imported up front.
+"""
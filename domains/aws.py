@@ -0,0 +1,33 @@
+"""EC2 inventory across regions."""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def describe_region_instances(client, region):
+    rows = []
+    for page in client.get_paginator("describe_instances").paginate():
+        for reservation in page["Reservations"]:
+            for instance in reservation["Instances"]:
+                tags = {t["Key"]: t["Value"] for t in instance.get("Tags", [])}
+                rows.append({
+                    "region": region, "instance_id": instance["InstanceId"], "name": tags.get("Name", ""),
+                    "state": instance["State"]["Name"], "type": instance["InstanceType"],
+                    "zone": instance["Placement"]["AvailabilityZone"],
+                    "private_ip": instance.get("PrivateIpAddress", ""), "public_ip": instance.get("PublicIpAddress", ""),
+                    "launched": str(instance["LaunchTime"]),
+                })
+    return rows
+
+def list_instances(clients):
+    """Lists instances in every region of {region: client} concurrently.
+
+    Returns the rows, sorted by region and launch time, and a {region: error}
+    dict for regions that failed.
+    """
+    rows, errors = [], {}
+    with ThreadPoolExecutor(max_workers=min(8, len(clients))) as pool:
+        futures = {pool.submit(describe_region_instances, client, region): region for region, client in clients.items()}
+        for future in as_completed(futures):
+            try:
+                rows.extend(future.result())
+            except Exception as e:
+                errors[futures[future]] = str(e)
+    return sorted(rows, key=lambda r: (r["region"], r["launched"])), errors
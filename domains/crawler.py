@@ -0,0 +1,141 @@
+"""Website download: a same-site crawler with conditional requests."""
+import hashlib
+import json
+import os
+import posixpath
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def url_to_path(root, url):
+    """Maps a URL to a file under ``root``/<host>/.
+
+    Directory URLs and extensionless paths are stored as ``<path>/index.html``
+    so that ``/docs`` and ``/docs/intro`` can both be saved. Raises ValueError
+    for URLs whose path would land outside ``root``.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = posixpath.normpath("/" + parts.path.lstrip("/"))
+    last = posixpath.basename(path)
+    if parts.path.endswith("/") or not last or "." not in last:
+        path = posixpath.join(path, "index.html")
+    if parts.query:
+        path += f"_{hashlib.sha1(parts.query.encode()).hexdigest()[:8]}"
+    host = parts.netloc.replace(":", "_")
+    if host in ("", ".", "..") or "/" in host or "\\" in host:
+        raise ValueError(f"Refusing to save {url}: invalid host")
+    target = os.path.join(root, host, path.lstrip("/"))
+    if os.path.commonpath([os.path.abspath(root), os.path.abspath(target)]) != os.path.abspath(root):
+        raise ValueError(f"Refusing to save {url} outside {root}")
+    return target
+
+def normalize_url(url):
+    """Resolves ``.``/``..`` segments and drops the fragment so equal pages get one URL."""
+    parts = urllib.parse.urlsplit(url.strip())
+    path = posixpath.normpath("/" + parts.path.lstrip("/"))
+    if parts.path.endswith("/") and path != "/":
+        path += "/"
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, parts.query, ""))
+
+class SiteFetcher:
+    """Crawls same-site links from seed URLs through one pooled HTTP session.
+
+    Bodies are streamed to disk in chunks. ETag and Last-Modified validators are
+    kept in ``<root>/.fetch_index.json`` so unchanged pages come back as 304s.
+    """
+    def __init__(self, requests, bs4, root="website_data", workers=8, chunk_size=64 * 1024):
+        self.requests, self.bs4 = requests, bs4
+        self.root, self.workers, self.chunk_size = root, workers, chunk_size
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.index_path = os.path.join(root, ".fetch_index.json")
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def fetch(self, url):
+        entry = self.index.get(url)
+        headers = {}
+        if entry and os.path.exists(entry["path"]):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        with self.session.get(url, headers=headers, stream=True, timeout=30) as r:
+            if r.status_code == 304:
+                return {"url": url, "status": 304, "bytes": 0, **entry}
+            r.raise_for_status()
+            path = url_to_path(self.root, r.url)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            size = 0
+            with open(f"{path}.part", "wb") as f:
+                for chunk in r.iter_content(self.chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(f"{path}.part", path)
+            entry = {"path": path, "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"),
+                     "html": "html" in r.headers.get("Content-Type", "")}
+            with self._lock:
+                self.index[url] = entry
+            return {"url": url, "status": r.status_code, "bytes": size, **entry}
+
+    def links(self, result):
+        """Returns the absolute same-site links of a fetched HTML page."""
+        if not result.get("html"):
+            return []
+        with open(result["path"], "rb") as f:
+            soup = self.bs4.BeautifulSoup(f, "html.parser")
+        site = urllib.parse.urlsplit(result["url"]).netloc
+        links = []
+        for anchor in soup.find_all("a", href=True):
+            link = urllib.parse.urldefrag(urllib.parse.urljoin(result["url"], anchor["href"]))[0]
+            parts = urllib.parse.urlsplit(link)
+            if parts.scheme in ("http", "https") and parts.netloc == site:
+                links.append(link)
+        return links
+
+    def crawl(self, seeds, depth, emit, max_pages=200):
+        """Fetches the seeds and, level by level, the same-site links up to ``depth`` hops away."""
+        started = time.perf_counter()
+        totals = {"fetched": 0, "not_modified": 0, "failed": 0, "bytes": 0}
+        frontier = list(dict.fromkeys(normalize_url(url) for url in seeds))
+        seen = set(frontier)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for level in range(depth + 1):
+                next_frontier = []
+                futures = {pool.submit(self.fetch, url): url for url in frontier}
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        totals["failed"] += 1
+                        emit(f"FAILED {futures[future]}: {e}\n")
+                        continue
+                    if result["status"] == 304:
+                        totals["not_modified"] += 1
+                        emit(f"304 {result['url']} (unchanged)\n")
+                    else:
+                        totals["fetched"] += 1
+                        totals["bytes"] += result["bytes"]
+                        emit(f"{result['status']} {result['url']} -> {result['path']} ({result['bytes']} bytes)\n")
+                    if level < depth:
+                        for link in self.links(result):
+                            if link not in seen and len(seen) < max_pages:
+                                seen.add(link)
+                                next_frontier.append(link)
+                frontier = next_frontier
+        self.session.close()
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, "w") as f:
+            json.dump(self.index, f, indent=2)
+        elapsed = time.perf_counter() - started
+        pages = totals["fetched"] + totals["not_modified"]
+        emit(f"{pages} pages ({totals['not_modified']} unchanged, {totals['failed']} failed) in {elapsed:.2f}s · "
+             f"{pages / elapsed:.1f} pages/s · {totals['bytes'] / 1024:.1f} KB transferred\n")
+        return 1 if totals["failed"] else 0
@@ -0,0 +1,292 @@
+"""Docker Engine API client, container stats and the demo app launchers."""
+import hashlib
+import http.client
+import io
+import json
+import os
+import socket
+import tarfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class DockerEngineError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=60):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class DockerEngine:
+    """Minimal Docker Engine API client talking to the daemon over its unix socket.
+
+    Every request opens its own connection, so one instance can be shared by
+    many threads and sessions.
+    """
+    def __init__(self, socket_path=None):
+        host = os.environ.get("DOCKER_HOST", "unix:///var/run/docker.sock")
+        self.socket_path = socket_path or host.replace("unix://", "", 1)
+
+    def _request(self, method, path, params=None, body=None, headers=None, timeout=60):
+        query = f"?{urllib.parse.urlencode(params)}" if params else ""
+        connection = UnixHTTPConnection(self.socket_path, timeout=timeout)
+        connection.request(method, f"{path}{query}", body=body, headers=headers or {})
+        response = connection.getresponse()
+        if response.status >= 400:
+            detail = response.read().decode("utf-8", "replace")
+            connection.close()
+            try:
+                detail = json.loads(detail).get("message", detail)
+            except ValueError:
+                pass
+            raise DockerEngineError(f"{method} {path}: {response.status} {detail}", response.status)
+        return response
+
+    def _json(self, method, path, params=None):
+        response = self._request(method, path, params)
+        data = response.read()
+        response.close()
+        return json.loads(data) if data else None
+
+    def _stream(self, method, path, params=None, body=None, headers=None):
+        """Yields the JSON objects of a newline-delimited streaming response."""
+        response = self._request(method, path, params, body, headers, timeout=None)
+        try:
+            for line in iter(response.readline, b""):
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            response.close()
+
+    def ping(self):
+        self._request("GET", "/_ping").read()
+
+    def containers(self):
+        return [{
+            "id": c["Id"][:12], "name": c["Names"][0].lstrip("/") if c["Names"] else "",
+            "image": c["Image"], "state": c["State"], "status": c["Status"],
+            "ports": ", ".join(f"{p.get('PublicPort', '')}->{p['PrivatePort']}/{p['Type']}" for p in c.get("Ports", [])),
+        } for c in self._json("GET", "/containers/json", {"all": 1})]
+
+    def images(self):
+        return [{
+            "id": i["Id"].split(":")[-1][:12], "tags": ", ".join(i.get("RepoTags") or ["<none>"]),
+            "size_mb": round(i["Size"] / 1e6, 1), "created": time.strftime("%Y-%m-%d %H:%M", time.localtime(i["Created"])),
+        } for i in self._json("GET", "/images/json")]
+
+    def stop(self, container):
+        self._request("POST", f"/containers/{container}/stop").read()
+
+    def remove_container(self, container, force=False):
+        self._request("DELETE", f"/containers/{container}", {"force": int(force)}).read()
+
+    def remove_image(self, image):
+        self._request("DELETE", f"/images/{image}").read()
+
+    def pull(self, image, emit):
+        """Pulls ``image``, emitting a line whenever a layer changes status."""
+        name, _, tag = image.rpartition(":") if ":" in image.split("/")[-1] else (image, "", "latest")
+        last_status = {}
+        for event in self._stream("POST", "/images/create", {"fromImage": name, "tag": tag}):
+            if "error" in event:
+                raise DockerEngineError(event["error"])
+            layer, status = event.get("id", ""), event.get("status", "")
+            if last_status.get(layer) != status:
+                last_status[layer] = status
+                emit(f"[{image}] {layer + ': ' if layer else ''}{status}\n")
+
+    def stats(self, container):
+        return self._stream("GET", f"/containers/{container}/stats", {"stream": 1})
+
+    def image_exists(self, image):
+        try:
+            self._json("GET", f"/images/{image}/json")
+            return True
+        except DockerEngineError as e:
+            if e.status == 404:
+                return False
+            raise
+
+    def build(self, files, tag, emit):
+        """Builds ``tag`` from an in-memory build context of {path: content}."""
+        context = io.BytesIO()
+        with tarfile.open(fileobj=context, mode="w") as tar:
+            for path, content in sorted(files.items()):
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(path)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        for event in self._stream("POST", "/build", {"t": tag, "rm": 1}, body=context.getvalue(),
+                                  headers={"Content-Type": "application/x-tar"}):
+            if "error" in event:
+                raise DockerEngineError(event["error"])
+            if event.get("stream"):
+                emit(event["stream"])
+
+    def inspect_container(self, container):
+        """Returns the container's inspect data, or None if it does not exist."""
+        try:
+            return self._json("GET", f"/containers/{container}/json")
+        except DockerEngineError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def run(self, image, name, ports, auto_remove=True):
+        """Creates and starts a detached container; ``ports`` maps container ports to host ports."""
+        bindings = {f"{c}/tcp": [{"HostPort": str(h)}] for c, h in ports.items()}
+        body = json.dumps({"Image": image, "ExposedPorts": {p: {} for p in bindings},
+                           "HostConfig": {"PortBindings": bindings, "AutoRemove": auto_remove}})
+        created = json.loads(self._request("POST", "/containers/create", {"name": name}, body=body,
+                                           headers={"Content-Type": "application/json"}).read())
+        self._request("POST", f"/containers/{created['Id']}/start").read()
+        return created["Id"]
+
+def run_docker_batch(operation, items, emit, max_workers=4):
+    """Applies ``operation`` to every item on a bounded thread pool; returns the number of failures."""
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(operation, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                emit(f"{futures[future]}: done\n")
+            except Exception as e:
+                failures += 1
+                emit(f"{futures[future]}: {e}\n")
+    return failures
+
+def summarize_stats(sample):
+    """Turns one Engine API stats sample into CPU, memory and network figures."""
+    cpu, precpu = sample.get("cpu_stats", {}), sample.get("precpu_stats", {})
+    cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or [1])
+    memory = sample.get("memory_stats", {})
+    cache = memory.get("stats", {}).get("inactive_file", memory.get("stats", {}).get("cache", 0))
+    networks = sample.get("networks", {}).values()
+    return {
+        "cpu_percent": round(cpu_delta / system_delta * online_cpus * 100, 2) if system_delta > 0 else 0.0,
+        "memory_mb": round((memory.get("usage", 0) - cache) / 1e6, 1),
+        "memory_limit_mb": round(memory.get("limit", 0) / 1e6, 1),
+        "net_rx_mb": round(sum(n.get("rx_bytes", 0) for n in networks) / 1e6, 2),
+        "net_tx_mb": round(sum(n.get("tx_bytes", 0) for n in networks) / 1e6, 2),
+    }
+
+class ContainerStatsCollector:
+    """Keeps the latest stats sample for each watched container, shared by every session.
+
+    One thread per container follows the Engine API's streaming stats endpoint
+    and stops once no session has asked for that container for ``linger`` seconds.
+    """
+    def __init__(self, linger=30):
+        self.linger = linger
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._wanted = {}
+
+    def watch(self, engine, containers):
+        now = time.monotonic()
+        with self._lock:
+            for container in containers:
+                if container not in self._wanted:
+                    threading.Thread(target=self._follow, args=(engine, container), daemon=True).start()
+                self._wanted[container] = now
+
+    def latest(self, containers):
+        with self._lock:
+            return [{"container": c, **self._latest[c]} for c in containers if c in self._latest]
+
+    def _follow(self, engine, container):
+        try:
+            for sample in engine.stats(container):
+                with self._lock:
+                    self._latest[container] = summarize_stats(sample)
+                    if time.monotonic() - self._wanted.get(container, 0) > self.linger:
+                        break
+        except Exception:
+            pass
+        with self._lock:
+            self._wanted.pop(container, None)
+            self._latest.pop(container, None)
+
+DEMO_APPS = {
+    "flask": {
+        "directory": "flask_app", "repository": "my-flask-app", "container": "flask_container", "port": 5000,
+        "files": {
+            "app.py": "from flask import Flask\napp = Flask(__name__)\n@app.route('/')\ndef hello(): return '<h1>Hello from Flask in Docker!</h1>'\nif __name__ == '__main__': app.run(host='0.0.0.0', port=5000)",
+            "Dockerfile": "FROM python:3.9-slim\nWORKDIR /app\nRUN pip install Flask\nCOPY app.py .\nCMD [\"python3\", \"-u\", \"app.py\"]",
+        },
+    },
+    "apache": {
+        "directory": "apache_server", "repository": "my-apache-server", "container": "apache_container", "port": 80,
+        "files": {
+            "index.html": "<h1>Apache server in Docker is LIVE!</h1>",
+            "Dockerfile": "FROM httpd:2.4\nCOPY ./index.html /usr/local/apache2/htdocs/",
+        },
+    },
+}
+
+def build_context_digest(files):
+    digest = hashlib.sha256()
+    for path, content in sorted(files.items()):
+        digest.update(path.encode() + b"\0" + content.encode() + b"\0")
+    return digest.hexdigest()
+
+def ensure_image(engine, app, emit):
+    """Returns an image tagged with the build context's hash, building it only if it does not exist yet."""
+    started = time.perf_counter()
+    tag = f"{app['repository']}:{build_context_digest(app['files'])[:12]}"
+    if engine.image_exists(tag):
+        emit(f"Reusing image {tag}; build skipped ({time.perf_counter() - started:.2f}s)\n")
+        return tag
+    os.makedirs(app["directory"], exist_ok=True)
+    for path, content in app["files"].items():
+        with open(os.path.join(app["directory"], path), "w") as f:
+            f.write(content)
+    engine.build(app["files"], tag, emit)
+    emit(f"Built image {tag} in {time.perf_counter() - started:.2f}s\n")
+    return tag
+
+def ensure_container(engine, image, name, container_port, host_port, emit):
+    """Starts ``name`` from ``image``, reusing a running container that already matches."""
+    existing = engine.inspect_container(name)
+    if existing:
+        bindings = existing["HostConfig"].get("PortBindings") or {}
+        bound_port = (bindings.get(f"{container_port}/tcp") or [{}])[0].get("HostPort")
+        if existing["State"]["Running"] and existing["Config"]["Image"] == image and bound_port == str(host_port):
+            emit(f"{name}: already running {image} on port {host_port}; reused\n")
+            return
+        emit(f"{name}: replacing container running {existing['Config']['Image']}\n")
+        engine.remove_container(name, force=True)
+    engine.run(image, name, {container_port: host_port})
+    emit(f"{name}: started {image} on http://localhost:{host_port}\n")
+
+def launch_demo_app(engine, app, first_port, replicas, emit, max_workers=8):
+    """Builds (or reuses) the app's image and runs ``replicas`` containers on consecutive ports."""
+    image = ensure_image(engine, app, emit)
+    if replicas == 1:
+        targets = [(app["container"], first_port)]
+    else:
+        targets = [(f"{app['container']}-{i}", first_port + i) for i in range(replicas)]
+    started = time.perf_counter()
+    failures = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, replicas)) as pool:
+        futures = [pool.submit(ensure_container, engine, image, name, app["port"], port, emit) for name, port in targets]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                emit(f"{e}\n")
+    emit(f"{replicas - failures}/{replicas} container(s) ready in {time.perf_counter() - started:.2f}s\n")
+    return failures
@@ -0,0 +1,176 @@
+"""Background jobs for Terraform and Ansible, and Ansible inventory parsing."""
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+
+from .runtime import remove_quietly
+
+class JobScheduler:
+    """Runs long shell operations in the background, shared by every session.
+
+    At most ``concurrency`` jobs run at once, jobs sharing any workspace key
+    never overlap, and jobs of a fan-out group respect the group's own limit.
+    Each job's state lives in ``<root>/<id>.json`` and its output in
+    ``<root>/<id>.log``, so any session can attach to it and history survives
+    restarts; only the newest ``retain`` finished jobs are kept. Environment
+    values (e.g. credentials) are never written to disk.
+    """
+    def __init__(self, root="jobs", concurrency=2, retain=200):
+        self.root = root
+        self.concurrency = concurrency
+        self.retain = retain
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._running = {}
+        self._cancelled = set()
+        self._on_success = {}
+        # In-memory index of every job record, so listing jobs never touches the disk.
+        self._jobs = {}
+        os.makedirs(root, exist_ok=True)
+        for name in os.listdir(root):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(root, name)) as f:
+                        job = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if isinstance(job["workspace"], str):
+                    job["workspace"] = [job["workspace"]]
+                self._jobs[job["id"]] = job
+                if job["state"] in ("queued", "running"):
+                    job["state"] = "interrupted"
+                    self._save(job)
+        self._prune()
+
+    def _path(self, job_id, suffix):
+        return os.path.join(self.root, f"{job_id}.{suffix}")
+
+    def _save(self, job):
+        self._jobs[job["id"]] = job
+        with open(self._path(job["id"], "json.tmp"), "w") as f:
+            json.dump(job, f, indent=2)
+        os.replace(self._path(job["id"], "json.tmp"), self._path(job["id"], "json"))
+
+    def _prune(self):
+        """Deletes the records and logs of finished jobs beyond the newest ``retain``."""
+        finished = sorted((j for j in list(self._jobs.values()) if j["state"] not in ("queued", "running")),
+                          key=lambda j: j["created"], reverse=True)
+        for job in finished[self.retain:]:
+            self._jobs.pop(job["id"], None)
+            remove_quietly(self._path(job["id"], "json"))
+            remove_quietly(self._path(job["id"], "log"))
+
+    def submit(self, name, command, workspace, cwd=".", env=None, group=None, group_limit=None, on_success=None):
+        """Queues a job and returns its id; ``on_success(job)`` runs in the worker if it exits with 0.
+
+        ``workspace`` is a key or a list of keys the job holds while it runs.
+        """
+        workspace = [workspace] if isinstance(workspace, str) else list(workspace)
+        job = {"id": uuid.uuid4().hex[:10], "name": name, "command": command, "workspace": workspace,
+               "cwd": cwd, "group": group, "group_limit": group_limit, "state": "queued",
+               "created": time.time(), "started": None, "finished": None, "returncode": None}
+        self._save(job)
+        with self._lock:
+            if on_success:
+                self._on_success[job["id"]] = on_success
+            self._pending.append((job, env or {}))
+        self._dispatch()
+        return job["id"]
+
+    def set_concurrency(self, concurrency):
+        """Changes how many jobs may run at once; a higher limit starts queued jobs right away."""
+        with self._lock:
+            self.concurrency = concurrency
+        self._dispatch()
+
+    def _dispatch(self):
+        with self._lock:
+            for job, env in list(self._pending):
+                if len(self._running) >= self.concurrency:
+                    break
+                busy = {key for j, _ in self._running.values() for key in j["workspace"]}
+                in_group = sum(1 for j, _ in self._running.values() if job["group"] and j["group"] == job["group"])
+                if busy.intersection(job["workspace"]) or (job["group_limit"] and in_group >= job["group_limit"]):
+                    continue
+                self._pending.remove((job, env))
+                self._running[job["id"]] = (job, None)
+                threading.Thread(target=self._run, args=(job, env), daemon=True).start()
+
+    def _run(self, job, env):
+        try:
+            if job["id"] in self._cancelled:
+                job["state"] = "cancelled"
+                return
+            job["state"], job["started"] = "running", time.time()
+            self._save(job)
+            with open(self._path(job["id"], "log"), "ab") as log:
+                process = subprocess.Popen(job["command"], shell=True, cwd=job["cwd"], stdout=log,
+                                           stderr=subprocess.STDOUT, env={**os.environ, **env},
+                                           start_new_session=True)
+                with self._lock:
+                    self._running[job["id"]] = (job, process)
+                    # A cancel that landed between the state check above and now had no process to signal.
+                    cancelled = job["id"] in self._cancelled
+                if cancelled:
+                    os.killpg(process.pid, signal.SIGTERM)
+                job["returncode"] = process.wait()
+            if job["id"] in self._cancelled:
+                job["state"] = "cancelled"
+            else:
+                job["state"] = "succeeded" if job["returncode"] == 0 else "failed"
+            if job["state"] == "succeeded" and job["id"] in self._on_success:
+                self._on_success.pop(job["id"])(job)
+        except Exception as e:
+            job["state"] = "failed"
+            with open(self._path(job["id"], "log"), "a") as log:
+                log.write(f"An unexpected error occurred: {e}\n")
+        finally:
+            job["finished"] = time.time()
+            self._save(job)
+            with self._lock:
+                self._running.pop(job["id"], None)
+                self._on_success.pop(job["id"], None)
+            self._prune()
+            self._dispatch()
+
+    def cancel(self, job_id):
+        with self._lock:
+            self._cancelled.add(job_id)
+            for job, env in list(self._pending):
+                if job["id"] == job_id:
+                    self._pending.remove((job, env))
+                    job["state"], job["finished"] = "cancelled", time.time()
+                    self._save(job)
+            process = self._running.get(job_id, (None, None))[1]
+        if process is not None and process.poll() is None:
+            os.killpg(process.pid, signal.SIGTERM)
+
+    def jobs(self, limit=50):
+        jobs = sorted((dict(j) for j in list(self._jobs.values())), key=lambda j: j["created"], reverse=True)
+        return jobs[:limit] if limit else jobs
+
+    def log_tail(self, job_id, size=16 * 1024):
+        try:
+            with open(self._path(job_id, "log"), "rb") as f:
+                f.seek(max(0, os.path.getsize(f.name) - size))
+                return f.read().decode("utf-8", "replace")
+        except OSError:
+            return ""
+
+def inventory_hosts(path="inventory.ini"):
+    """Returns the host names listed in an INI-style Ansible inventory."""
+    hosts = []
+    section = ""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                section = line
+            elif line and not line.startswith(("#", ";")) and ":vars]" not in section and ":children]" not in section:
+                hosts.append(line.split()[0])
+    return list(dict.fromkeys(hosts))
@@ -0,0 +1,136 @@
+"""Kubernetes pod informer, label selectors and concurrent pod creation."""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def summarize_pod(pod):
+    statuses = pod.status.container_statuses or []
+    return {
+        "namespace": pod.metadata.namespace, "name": pod.metadata.name, "phase": pod.status.phase,
+        "ready": f"{sum(1 for c in statuses if c.ready)}/{len(pod.spec.containers)}",
+        "restarts": sum(c.restart_count for c in statuses), "node": pod.spec.node_name or "",
+        "ip": pod.status.pod_ip or "", "labels": pod.metadata.labels or {},
+        "started": str(pod.status.start_time or ""),
+    }
+
+class PodInformer:
+    """Process-wide, in-memory index of every pod in the cluster.
+
+    Lists pods once, then follows a watch stream from that list's
+    resourceVersion, re-listing only if the watch expires or fails. Every
+    session reads from this index instead of listing pods itself.
+    """
+    def __init__(self, core_api, k8s_watch):
+        self.core_api = core_api
+        self._k8s_watch = k8s_watch
+        self._lock = threading.Lock()
+        self._pods = {}
+        self.synced = False
+        self.error = None
+        self.stats = {"lists": 0, "events": 0, "last_event": None}
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _list(self):
+        pods = self.core_api.list_pod_for_all_namespaces()
+        with self._lock:
+            self._pods = {p.metadata.uid: summarize_pod(p) for p in pods.items}
+            self.stats["lists"] += 1
+            self.synced = True
+        return pods.metadata.resource_version
+
+    def _run(self):
+        resource_version = None
+        while True:
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                    self.error = None
+                watch = self._k8s_watch.Watch()
+                for event in watch.stream(self.core_api.list_pod_for_all_namespaces,
+                                          resource_version=resource_version, timeout_seconds=300):
+                    if event["type"] == "ERROR":
+                        # Usually 410 Gone: our resourceVersion is too old to resume from.
+                        resource_version = None
+                        break
+                    pod = event["object"]
+                    with self._lock:
+                        if event["type"] == "DELETED":
+                            self._pods.pop(pod.metadata.uid, None)
+                        else:
+                            self._pods[pod.metadata.uid] = summarize_pod(pod)
+                        self.stats["events"] += 1
+                        self.stats["last_event"] = time.time()
+                    resource_version = pod.metadata.resource_version
+                self.error = None
+            except Exception as e:
+                if getattr(e, "status", None) != 410:
+                    self.error = str(e)
+                    time.sleep(5)
+                resource_version = None
+
+    def pods(self, namespace=None, labels=None, phase=None):
+        """Returns the indexed pods matching a namespace, label requirements and a phase.
+
+        ``labels`` is a list of requirements as returned by parse_label_selector.
+        """
+        with self._lock:
+            pods = list(self._pods.values())
+        return sorted((p for p in pods
+                       if (not namespace or p["namespace"] == namespace)
+                       and (not phase or p["phase"] == phase)
+                       and all(label_matches(p["labels"], *requirement) for requirement in labels or [])),
+                      key=lambda p: (p["namespace"], p["name"]))
+
+LABEL_REQUIREMENT = re.compile(r"^(!?)\s*([A-Za-z0-9./_-]+)\s*(?:(==|!=|=)\s*([A-Za-z0-9._-]*))?$")
+
+def parse_label_selector(text):
+    """Parses an equality-based selector such as ``app=web,tier!=cache,!canary``.
+
+    Supports ``=``, ``==``, ``!=``, ``key`` (label exists) and ``!key`` (label
+    absent), and returns a list of (key, operator, value) requirements.
+    Set-based requirements (``in``, ``notin``) raise ValueError.
+    """
+    requirements = []
+    for part in (p.strip() for p in text.split(",")):
+        if not part:
+            continue
+        match = LABEL_REQUIREMENT.match(part)
+        if not match or (match.group(1) and match.group(3)):
+            raise ValueError(f"Unsupported label requirement {part!r}; use key=value, key!=value, key or !key.")
+        negated, key, operator, value = match.groups()
+        if operator:
+            requirements.append((key, "!=" if operator == "!=" else "=", value))
+        else:
+            requirements.append((key, "!exists" if negated else "exists", None))
+    return requirements
+
+def label_matches(labels, key, operator, value):
+    if operator == "=":
+        return labels.get(key) == value
+    if operator == "!=":
+        return labels.get(key) != value
+    return (key in labels) == (operator == "exists")
+
+def create_pods(core_api, namespace, name, image, replicas, emit, max_workers=8):
+    """Creates ``replicas`` single-container pods concurrently; returns the number of failures."""
+    names = [name] if replicas == 1 else [f"{name}-{i}" for i in range(1, replicas + 1)]
+
+    def create(pod_name):
+        core_api.create_namespaced_pod(namespace, {
+            "apiVersion": "v1", "kind": "Pod",
+            "metadata": {"name": pod_name, "labels": {"run": name}},
+            "spec": {"containers": [{"name": name, "image": image}]},
+        })
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+        futures = {pool.submit(create, pod_name): pod_name for pod_name in names}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                emit(f"pod/{futures[future]} created\n")
+            except Exception as e:
+                failures += 1
+                emit(f"pod/{futures[future]}: {getattr(e, 'reason', None) or e}\n")
+    return failures
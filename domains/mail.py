@@ -0,0 +1,166 @@
+"""Bulk email: pooled SMTP connections and a background delivery queue."""
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.image import MIMEImage
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+class SMTPPool:
+    """Authenticated SMTP connections that stay open and are reused across sends.
+
+    At most ``size`` connections exist at once. A connection the server has
+    dropped is replaced transparently on the next send.
+    """
+    def __init__(self, host, port, username, password, starttls=True, size=4):
+        self.host, self.port = host, port
+        self.username, self.password = username, password
+        self.starttls = starttls
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.stats = {"connects": 0, "sent": 0}
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                # STARTTLS discards what the server advertised; ask again over TLS.
+                server.ehlo()
+            # Local stand-in servers often do not offer AUTH at all.
+            if self.username and server.has_extn("auth"):
+                server.login(self.username, self.password)
+        except Exception:
+            self._quit(server)
+            raise
+        self.stats["connects"] += 1
+        return server
+
+    @staticmethod
+    def _is_dropped(error):
+        """True if ``error`` means the connection itself is gone, not that the server refused a message."""
+        # smtplib.SMTPException subclasses OSError, so plain socket errors have to be told apart.
+        return isinstance(error, smtplib.SMTPServerDisconnected) or (
+            isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException))
+
+    def send(self, message):
+        """Sends ``message`` on a pooled connection.
+
+        A dropped connection is replaced and the send retried once; any other
+        error (e.g. refused recipients) is raised and the still-healthy
+        connection goes back to the pool.
+        """
+        with self._slots:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+            try:
+                try:
+                    server.send_message(message)
+                except Exception as e:
+                    if not self._is_dropped(e):
+                        raise
+                    self._quit(server)
+                    server = None
+                    server = self._connect()
+                    server.send_message(message)
+                self.stats["sent"] += 1
+            except Exception as e:
+                if server is not None and self._is_dropped(e):
+                    self._quit(server)
+                    server = None
+                raise
+            finally:
+                if server is not None:
+                    self._idle.put(server)
+
+    @staticmethod
+    def _quit(server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+def message_factory(sender, subject, body, attachment_bytes=None):
+    """Returns a function building the message for one recipient.
+
+    The attachment is encoded once and the same MIME part is shared by every
+    message of the batch.
+    """
+    attachment = MIMEImage(attachment_bytes, name="capture.jpg") if attachment_bytes else None
+
+    def build(recipient):
+        msg = MIMEMultipart()
+        msg['From'] = sender
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        if attachment:
+            msg.attach(attachment)
+        return msg
+    return build
+
+class MailBatch:
+    """Per-recipient delivery status of one bulk send."""
+    def __init__(self, recipients):
+        self._lock = threading.Lock()
+        self.status = {r: "queued" for r in recipients}
+        self.started = time.time()
+        self.finished = None
+
+    def update(self, recipient, status):
+        with self._lock:
+            self.status[recipient] = status
+            if all(s == "sent" or s.startswith("failed") for s in self.status.values()):
+                self.finished = time.time()
+
+    def rows(self):
+        with self._lock:
+            return [{"recipient": r, "status": s} for r, s in self.status.items()]
+
+class MailQueue:
+    """Background delivery of mail batches with bounded concurrency and retries with backoff."""
+    def __init__(self, workers=4, retries=3, backoff=2.0):
+        self.retries, self.backoff = retries, backoff
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mail")
+
+    def submit(self, pool, recipients, build):
+        batch = MailBatch(recipients)
+        for recipient in recipients:
+            self._executor.submit(self._deliver, pool, batch, recipient, build)
+        return batch
+
+    def _deliver(self, pool, batch, recipient, build):
+        for attempt in range(1, self.retries + 1):
+            batch.update(recipient, f"sending (attempt {attempt})")
+            try:
+                pool.send(build(recipient))
+                batch.update(recipient, "sent")
+                return
+            except smtplib.SMTPRecipientsRefused as e:
+                batch.update(recipient, f"failed: {e}")
+                return
+            except Exception as e:
+                if attempt == self.retries:
+                    batch.update(recipient, f"failed: {e}")
+                    return
+                batch.update(recipient, f"retrying: {e}")
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+def parse_recipients(text, uploaded_file=None):
+    """Collects unique addresses from a comma/newline separated string and an optional uploaded list."""
+    raw = text.replace(",", "\n").splitlines()
+    if uploaded_file is not None:
+        raw += uploaded_file.getvalue().decode("utf-8", "replace").replace(",", "\n").splitlines()
+    return list(dict.fromkeys(r.strip() for r in raw if "@" in r))
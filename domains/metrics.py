@@ -0,0 +1,66 @@
+"""Live host metrics sampled into a fixed-size ring buffer."""
+import threading
+import time
+from array import array
+
+METRIC_FIELDS = ("cpu_percent", "memory_percent", "disk_read_mbps", "disk_write_mbps", "net_sent_mbps", "net_recv_mbps")
+
+class MetricsSampler:
+    """Samples host metrics on one background thread per process into a fixed-size ring buffer.
+
+    Every metric is an ``array('d')`` of ``capacity`` slots, so memory stays
+    constant however long the process runs. All sessions read the same buffer.
+    """
+    def __init__(self, psutil, interval=2.0, capacity=3600):
+        self.psutil = psutil
+        self.interval = interval
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._times = array('d', bytes(8 * capacity))
+        self._series = {field: array('d', bytes(8 * capacity)) for field in METRIC_FIELDS}
+        self._next = 0
+        self.count = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _counters(self):
+        disk, net = self.psutil.disk_io_counters(), self.psutil.net_io_counters()
+        return (disk.read_bytes if disk else 0, disk.write_bytes if disk else 0,
+                net.bytes_sent if net else 0, net.bytes_recv if net else 0)
+
+    def _run(self):
+        self.psutil.cpu_percent(None)
+        previous, previous_time = self._counters(), time.time()
+        while True:
+            time.sleep(self.interval)
+            counters, now = self._counters(), time.time()
+            elapsed = max(now - previous_time, 1e-6)
+            rates = [(c - p) / elapsed / 1e6 for c, p in zip(counters, previous)]
+            values = (self.psutil.cpu_percent(None), self.psutil.virtual_memory().percent, *rates)
+            with self._lock:
+                self._times[self._next] = now
+                for field, value in zip(METRIC_FIELDS, values):
+                    self._series[field][self._next] = value
+                self._next = (self._next + 1) % self.capacity
+                self.count = min(self.count + 1, self.capacity)
+            previous, previous_time = counters, now
+
+    def window(self, seconds=None):
+        """Returns {"time": [...], <metric>: [...]} for samples in the last ``seconds``, oldest first."""
+        with self._lock:
+            order = [(self._next - self.count + i) % self.capacity for i in range(self.count)]
+            cutoff = time.time() - seconds if seconds else 0
+            order = [i for i in order if self._times[i] >= cutoff]
+            columns = {"time": [self._times[i] for i in order]}
+            for field in METRIC_FIELDS:
+                series = self._series[field]
+                columns[field] = [series[i] for i in order]
+        return columns
+
+def downsample(columns, max_points=300):
+    """Averages consecutive samples into at most ``max_points`` buckets."""
+    size = len(columns["time"])
+    if size <= max_points:
+        return columns
+    bucket = -(-size // max_points)
+    return {name: [sum(values[i:i + bucket]) / len(values[i:i + bucket]) for i in range(0, size, bucket)]
+            for name, values in columns.items()}
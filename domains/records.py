@@ -0,0 +1,118 @@
+"""MongoDB record browser: keyset pagination and streaming bulk import."""
+import csv
+import json
+import re
+import time
+
+RECORD_FIELDS = {"name": 1, "email": 1, "timestamp": 1}
+RECORD_SORT = [("timestamp", -1), ("_id", -1)]
+
+def create_record_indexes(collection):
+    """Creates the indexes fetch_records_page relies on."""
+    # Equality-Sort-Range: a prefix filter is a range, so it follows the page sort in each index.
+    # The page is then read in index order and the filter checked against index keys, with no
+    # in-memory sort. Either index also serves the unfiltered page.
+    collection.create_index(RECORD_SORT + [("name", 1)])
+    collection.create_index(RECORD_SORT + [("email", 1)])
+
+def fetch_records_page(collection, name_prefix="", email_prefix="", after=None, page_size=50):
+    """Returns one page of records, newest first, and whether another page follows.
+
+    Pages are keyed on the (timestamp, _id) of the last record shown rather than
+    skipped over, so every page costs the same regardless of how deep it is.
+    """
+    clauses = []
+    if name_prefix:
+        clauses.append({"name": {"$regex": f"^{re.escape(name_prefix)}"}})
+    if email_prefix:
+        clauses.append({"email": {"$regex": f"^{re.escape(email_prefix)}"}})
+    if after is not None:
+        timestamp, last_id = after
+        clauses.append({"$or": [{"timestamp": {"$lt": timestamp}},
+                                {"timestamp": timestamp, "_id": {"$lt": last_id}}]})
+    query = {"$and": clauses} if clauses else {}
+    records = list(collection.find(query, RECORD_FIELDS).sort(RECORD_SORT).limit(page_size + 1))
+    return records[:page_size], len(records) > page_size
+
+def validate_record(row):
+    """Returns the record ready for insertion, or raises ValueError explaining why it is rejected."""
+    if not isinstance(row, dict):
+        raise ValueError("not an object")
+    if None in row:
+        raise ValueError("more columns than the header")
+    if any(not isinstance(key, str) or key.startswith("$") for key in row):
+        raise ValueError("field names must be text and must not start with '$'")
+    for field in ("name", "email"):
+        if not isinstance(row.get(field), str) or not row[field].strip():
+            raise ValueError(f"missing or non-text {field!r}")
+    timestamp = row.get("timestamp")
+    if timestamp in (None, ""):
+        timestamp = time.time()
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float, str)):
+        raise ValueError("timestamp must be a number")
+    try:
+        row["timestamp"] = float(timestamp)
+    except ValueError:
+        raise ValueError(f"timestamp {timestamp!r} is not a number") from None
+    return row
+
+def read_uploaded_records(uploaded_file, rejected):
+    """Yields valid records from an uploaded CSV or JSONL file without loading it all at once.
+
+    Rows that cannot be imported are skipped and appended to ``rejected`` as
+    (line number, reason). A CSV file that is not UTF-8 or not parseable stops
+    the import at the offending line.
+    """
+    if not uploaded_file.name.lower().endswith(".csv"):
+        for line_number, raw in enumerate(uploaded_file, start=1):
+            try:
+                line = raw.decode("utf-8")
+                if line.strip():
+                    yield validate_record(json.loads(line))
+            except ValueError as e:  # covers UnicodeDecodeError and json.JSONDecodeError
+                rejected.append((line_number, str(e)))
+        return
+
+    position = {"line": 0}
+
+    def decoded_lines():
+        for raw in uploaded_file:
+            position["line"] += 1
+            yield raw.decode("utf-8")
+
+    try:
+        for row in csv.DictReader(decoded_lines()):
+            try:
+                yield validate_record(row)
+            except ValueError as e:
+                rejected.append((position["line"], str(e)))
+    except UnicodeDecodeError:
+        rejected.append((position["line"], "not valid UTF-8; import stopped here"))
+    except csv.Error as e:
+        rejected.append((position["line"], f"malformed CSV ({e}); import stopped here"))
+
+def import_records(collection, records, errors, batch_size=1000):
+    """Inserts records with batched insert_many calls; returns (inserted, rejected by the server).
+
+    ``errors`` is the pymongo.errors module. Documents the server refuses (e.g.
+    a duplicate ``_id``) are counted without aborting the rest of the batch.
+    """
+    inserted = refused = 0
+
+    def flush(batch):
+        nonlocal inserted, refused
+        try:
+            inserted += len(collection.insert_many(batch, ordered=False).inserted_ids)
+        except errors.BulkWriteError as e:
+            inserted += e.details.get("nInserted", 0)
+            refused += len(e.details.get("writeErrors", []))
+
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return inserted, refused
@@ -0,0 +1,351 @@
+"""Shared runtime used on every page of the control center.
+
+The rerun profiler, the per-session terminal log and command runner, and the
+process-wide client registry.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+
+import streamlit as st
+
+class RerunProfiler:
+    """Opt-in timing of one script run, switched on with ``DEVOPS_PROFILE=1``.
+
+    Sections are timed with perf_counter and shown in the sidebar's Rerun
+    Profile panel; with ``DEVOPS_PROFILE_LOG=<path>`` each completed run is also
+    appended to that file as one JSON line. Runs cut short by ``st.rerun()`` are
+    not recorded. When profiling is off, ``section`` does nothing.
+    """
+    def __init__(self, enabled, log_path=None):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.started = time.perf_counter()
+        self.sections = []
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        depth = self._depth
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self.sections.append({"section": name, "depth": depth,
+                                  "start_ms": round((started - self.started) * 1000, 2),
+                                  "ms": round((time.perf_counter() - started) * 1000, 2)})
+
+    def finish(self, choice):
+        """Records the run and renders the breakdown panel."""
+        if not self.enabled:
+            return
+        total_ms = (time.perf_counter() - self.started) * 1000
+        sections = sorted(self.sections, key=lambda s: s["start_ms"])
+        other_ms = total_ms - sum(s["ms"] for s in sections if s["depth"] == 0)
+        record = {"timestamp": time.time(), "choice": choice, "total_ms": round(total_ms, 2),
+                  "other_ms": round(other_ms, 2), "terminal_log_bytes": st.session_state.terminal_log.size,
+                  "sections": sections}
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        history = st.session_state.setdefault("profile_history", deque(maxlen=100))
+        history.append(total_ms)
+        totals = sorted(history)
+        with st.sidebar.expander("Rerun Profile"):
+            st.write(f"**This run:** {total_ms:.1f} ms · **p50:** {totals[len(totals) // 2]:.1f} ms · "
+                     f"**p95:** {totals[min(len(totals) - 1, int(len(totals) * 0.95))]:.1f} ms over {len(totals)} run(s)")
+            rows = [{"section": "  " * s["depth"] + s["section"], "ms": s["ms"]} for s in sections]
+            rows.append({"section": "other (module setup, definitions)", "ms": round(other_ms, 2)})
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            st.download_button("Download JSON", json.dumps(record, indent=2), file_name="rerun_profile.json", mime="application/json")
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class TerminalLog:
+    """Terminal history for one session with a fixed memory budget.
+
+    Recent output lives in a ring of chunks. Once it grows past
+    ``memory_budget`` bytes the oldest chunks are appended to a per-session
+    spill file, where they can still be paged through or searched. It is safe
+    to write from a CommandRunner's worker thread while the page reads it.
+    """
+    PAGE_SIZE = 16 * 1024
+    TAIL_WINDOW = 16 * 1024
+
+    def __init__(self, memory_budget=256 * 1024, spill_dir=None):
+        self.memory_budget = memory_budget
+        spill_dir = spill_dir or os.path.join(tempfile.gettempdir(), "devops-terminal")
+        self.spill_path = os.path.join(spill_dir, f"{uuid.uuid4().hex}.log")
+        self._chunks = deque()
+        self._lock = threading.RLock()
+        self.memory_size = 0
+        self.spilled_size = 0
+        weakref.finalize(self, remove_quietly, self.spill_path)
+
+    @property
+    def size(self):
+        return self.spilled_size + self.memory_size
+
+    @property
+    def pages(self):
+        return max(1, -(-self.size // self.PAGE_SIZE))
+
+    def write(self, text):
+        if not text:
+            return
+        data = text.encode("utf-8", "replace")
+        with self._lock:
+            self._chunks.append(data)
+            self.memory_size += len(data)
+            if self.memory_size > self.memory_budget:
+                self._spill()
+
+    def _spill(self):
+        # Spill down to three quarters of the budget so a stream of small
+        # writes does not reopen the spill file for every line.
+        target = self.memory_budget * 3 // 4
+        os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+        with open(self.spill_path, "ab") as f:
+            while self.memory_size > target:
+                chunk = self._chunks.popleft()
+                excess = self.memory_size - target
+                if excess < len(chunk):
+                    # Only part of the oldest chunk has to go; keep the rest in memory.
+                    self._chunks.appendleft(chunk[excess:])
+                    chunk = chunk[:excess]
+                f.write(chunk)
+                self.memory_size -= len(chunk)
+                self.spilled_size += len(chunk)
+
+    def read(self, start, end):
+        """Returns the text between byte offsets ``start`` and ``end`` of the whole log."""
+        with self._lock:
+            start, end = max(0, start), min(end, self.size)
+            parts = []
+            if start < self.spilled_size:
+                with open(self.spill_path, "rb") as f:
+                    f.seek(start)
+                    parts.append(f.read(min(end, self.spilled_size) - start))
+            if end > self.spilled_size:
+                memory = b"".join(self._chunks)
+                parts.append(memory[max(0, start - self.spilled_size):end - self.spilled_size])
+        return b"".join(parts).decode("utf-8", "replace")
+
+    def tail(self, window=TAIL_WINDOW):
+        with self._lock:
+            return self.read(self.size - window, self.size)
+
+    def page(self, number):
+        """Returns page ``number`` counted back from the newest output (1 = newest)."""
+        with self._lock:
+            end = self.size - (number - 1) * self.PAGE_SIZE
+            return self.read(end - self.PAGE_SIZE, end)
+
+    def search(self, term, limit=200):
+        """Returns the last ``limit`` lines containing ``term`` (case-insensitive)."""
+        needle = term.lower().encode("utf-8", "replace")
+        matches = deque(maxlen=limit)
+        with self._lock:
+            if self.spilled_size:
+                with open(self.spill_path, "rb") as f:
+                    for line in f:
+                        if needle in line.lower():
+                            matches.append(line)
+            memory = b"".join(self._chunks)
+        for line in memory.splitlines(keepends=True):
+            if needle in line.lower():
+                matches.append(line)
+        return b"".join(matches).decode("utf-8", "replace")
+
+    def clear(self, banner=""):
+        with self._lock:
+            remove_quietly(self.spill_path)
+            self._chunks.clear()
+            self.memory_size = self.spilled_size = 0
+            self.write(banner)
+
+class CommandRunner:
+    """Runs a session's shell commands one after another on a background thread.
+
+    Output is written line by line into the session's TerminalLog as the child
+    produces it, so the Live Terminal can show it while the command is still
+    running and memory stays within the log's budget even if nobody is
+    watching. In-process tasks (e.g. Docker Engine API calls) can be queued the
+    same way with submit_task.
+    """
+    def __init__(self, log):
+        self.log = log
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._busy = False
+        self.timings = []
+
+    @property
+    def busy(self):
+        with self._lock:
+            return self._busy
+
+    def submit(self, command, cwd="."):
+        self.submit_task(f"cd {cwd} && {command}", lambda emit: self._run_shell(command, cwd, emit))
+
+    def submit_task(self, label, task):
+        """Queues ``task(emit)``; it streams output through ``emit`` and returns an exit code."""
+        with self._lock:
+            self._pending.append((label, task))
+            if not self._busy:
+                self._busy = True
+                threading.Thread(target=self._work, daemon=True).start()
+
+    def _emit(self, text):
+        self.log.write(text)
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._busy = False
+                    return
+                label, task = self._pending.popleft()
+            self._execute(label, task)
+
+    def _execute(self, label, task):
+        self._emit(f"\n\n$ {label}\n")
+        started = time.perf_counter()
+        first_byte = None
+
+        def emit(text):
+            nonlocal first_byte
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            self._emit(text)
+
+        try:
+            returncode = task(emit)
+            if returncode:
+                self._emit(f"--- ERROR ---\nReturn Code: {returncode}\n")
+        except Exception as general_error:
+            returncode = None
+            self._emit(f"An unexpected error occurred: {general_error}\n")
+        total = time.perf_counter() - started
+        ttfb = f"{first_byte:.2f}s" if first_byte is not None else "n/a"
+        self._emit(f"--- first byte: {ttfb} | total: {total:.2f}s ---\n")
+        with self._lock:
+            self.timings.append({"command": label, "returncode": returncode,
+                                 "first_byte_s": first_byte, "total_s": total})
+
+    @staticmethod
+    def _run_shell(command, cwd, emit):
+        def pump(stream):
+            for line in iter(stream.readline, ""):
+                emit(line)
+
+        process = subprocess.Popen(
+            command, shell=True, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, text=True, cwd=cwd, bufsize=1
+        )
+        stderr_pump = threading.Thread(target=pump, args=(process.stderr,), daemon=True)
+        stderr_pump.start()
+        pump(process.stdout)
+        stderr_pump.join()
+        return process.wait()
+
+class ResourceRegistry:
+    """Process-wide cache of service clients, shared by every session.
+
+    Each client is built once per (kind, credential set). Entries idle for
+    longer than ``idle_timeout`` seconds are closed, and entries with a health
+    check are re-verified every ``health_interval`` seconds and rebuilt if the
+    check fails.
+    """
+    def __init__(self, idle_timeout=900, health_interval=30):
+        self.idle_timeout = idle_timeout
+        self.health_interval = health_interval
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._key_locks = {}
+        self.stats = {"hits": 0, "builds": 0, "reconnects": 0, "evictions": 0, "setup_s": 0.0}
+
+    def get(self, kind, credentials, factory, label="", health_check=None):
+        """Returns the shared client for ``kind`` and ``credentials``, building it with ``factory`` if needed.
+
+        Health checks and builds run under a lock for that key only, so a slow
+        or unreachable service never holds up lookups of other clients.
+        """
+        # Credentials only ever appear in the key as a digest.
+        key = (kind, hashlib.sha256(repr(credentials).encode()).hexdigest())
+        with self._lock:
+            evicted = self._evict_idle(time.monotonic())
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        for entry in evicted:
+            self._close(entry)
+        with key_lock:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry and health_check and now - entry["checked"] > self.health_interval:
+                try:
+                    health_check(entry["client"])
+                    entry["checked"] = now
+                except Exception:
+                    with self._lock:
+                        self._entries.pop(key, None)
+                        self.stats["reconnects"] += 1
+                    self._close(entry)
+                    entry = None
+            if entry:
+                with self._lock:
+                    entry["last_used"] = now
+                    entry["hits"] += 1
+                    self.stats["hits"] += 1
+                return entry["client"]
+            started = time.perf_counter()
+            client = factory()
+            setup_s = time.perf_counter() - started
+            with self._lock:
+                self._entries[key] = {"kind": kind, "label": label, "client": client, "created": now,
+                                      "last_used": now, "checked": now, "hits": 0, "setup_s": setup_s}
+                self.stats["builds"] += 1
+                self.stats["setup_s"] += setup_s
+            return client
+
+    def _evict_idle(self, now):
+        """Removes idle entries and returns them; the caller closes them outside the lock."""
+        evicted = []
+        for key in [k for k, e in self._entries.items() if now - e["last_used"] > self.idle_timeout]:
+            evicted.append(self._entries.pop(key))
+            self.stats["evictions"] += 1
+        return evicted
+
+    @staticmethod
+    def _close(entry):
+        close = getattr(entry["client"], "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            return [{"kind": e["kind"], "label": e["label"], "hits": e["hits"],
+                     "setup_ms": round(e["setup_s"] * 1000, 1),
+                     "age_s": round(now - e["created"]), "idle_s": round(now - e["last_used"])}
+                    for e in self._entries.values()]
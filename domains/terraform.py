@@ -0,0 +1,93 @@
+"""Terraform acceleration: provider caching, saved plans and phase timings."""
+import hashlib
+import json
+import os
+import time
+
+TF_PLAN_FILE = "tfplan"
+TF_PLAN_META = "tfplan.meta.json"
+
+def terraform_env(directory="."):
+    """Environment for Terraform jobs: a shared provider plugin cache and, if present, a local mirror.
+
+    The cache lets repeated inits across workspaces reuse downloaded providers.
+    When ``TF_PROVIDER_MIRROR`` (default ~/.terraform.d/providers-mirror)
+    exists, providers are installed from it and never from the network.
+    If the cache or config cannot be written (e.g. a read-only HOME), that
+    setting is left out and Terraform falls back to its defaults.
+    """
+    env = {"TF_IN_AUTOMATION": "1"}
+    cache_dir = os.path.expanduser(os.environ.get("TF_PLUGIN_CACHE_DIR", "~/.terraform.d/plugin-cache"))
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        env["TF_PLUGIN_CACHE_DIR"] = cache_dir
+    except OSError:
+        pass
+    mirror = terraform_mirror_dir()
+    if os.path.isdir(mirror):
+        config_path = os.path.abspath(os.path.join(directory, ".terraformrc.mirror"))
+        config = (f'plugin_cache_dir = "{cache_dir}"\n' if "TF_PLUGIN_CACHE_DIR" in env else "") + \
+                 f'provider_installation {{\n  filesystem_mirror {{\n    path = "{mirror}"\n  }}\n}}\n'
+        try:
+            # Only rewrite the file when the settings change, not on every rerun.
+            try:
+                with open(config_path) as f:
+                    current = f.read()
+            except FileNotFoundError:
+                current = None
+            if current != config:
+                with open(config_path, "w") as f:
+                    f.write(config)
+            env["TF_CLI_CONFIG_FILE"] = config_path
+        except OSError:
+            pass
+    return env
+
+def terraform_mirror_dir():
+    return os.path.expanduser(os.environ.get("TF_PROVIDER_MIRROR", "~/.terraform.d/providers-mirror"))
+
+def terraform_fingerprint(directory="."):
+    """Hashes of the configuration (*.tf, *.tfvars, lock file) and of the local state."""
+    def digest(paths):
+        h = hashlib.sha256()
+        for path in sorted(paths):
+            h.update(path.encode() + b"\0")
+            with open(path, "rb") as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    config = [os.path.join(directory, n) for n in os.listdir(directory)
+              if n.endswith((".tf", ".tfvars")) or n == ".terraform.lock.hcl"]
+    state = [p for p in [os.path.join(directory, "terraform.tfstate")] if os.path.exists(p)]
+    return {"config": digest(config), "state": digest(state)}
+
+def saved_plan_is_current(directory=".", options=None):
+    """True if the saved plan was made from the current configuration and state.
+
+    If ``options`` is given, the plan must also have been made with those plan options.
+    """
+    try:
+        with open(os.path.join(directory, TF_PLAN_META)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (os.path.exists(os.path.join(directory, TF_PLAN_FILE))
+            and meta.get("fingerprint") == terraform_fingerprint(directory)
+            and (options is None or meta.get("options") == options))
+
+def record_saved_plan(fingerprint, options, directory="."):
+    # The plan holds resource attributes from state; keep it readable by the app's user only.
+    os.chmod(os.path.join(directory, TF_PLAN_FILE), 0o600)
+    with open(os.path.join(directory, TF_PLAN_META), "w") as f:
+        json.dump({"fingerprint": fingerprint, "options": options, "created": time.time()}, f, indent=2)
+
+def terraform_phase_timings(jobs):
+    """Summarizes finished Terraform job runtimes per phase (init, plan, apply, ...)."""
+    phases = {}
+    for job in jobs:
+        if job["name"].startswith("terraform ") and job["started"] and job["finished"] and job["state"] == "succeeded":
+            phases.setdefault(job["name"].split()[1], []).append(job["finished"] - job["started"])
+    return [{"phase": phase, "runs": len(times), "last_s": round(times[0], 1),
+             "avg_s": round(sum(times) / len(times), 1), "min_s": round(min(times), 1)}
+            for phase, times in phases.items()]
@@ -0,0 +1,85 @@
+"""Voice command translation: Gemini prompts and a persistent translation cache."""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TRANSLATION_PROMPT = "You are an expert AI that translates human language into a single, executable Linux shell command. Your response MUST be ONLY the shell command itself, with no explanation or formatting. If you cannot determine a clear and safe command, respond with the exact string 'ERROR:UNCLEAR'.\nUser's request: '{request}'\nYour command:"
+
+def normalize_utterance(text):
+    """Collapses whitespace to build the cache key for a request.
+
+    Punctuation and case are kept: ``a.b`` and ``a b`` or ``Docs`` and ``docs``
+    can name different files, and cached commands are run without review.
+    """
+    return " ".join(text.split())
+
+class TranslationCache:
+    """LRU cache of normalized request -> shell command with a TTL, persisted to a JSON file."""
+    def __init__(self, path=".cache/translations-v2.json", capacity=500, ttl=7 * 24 * 3600):
+        self.path, self.capacity, self.ttl = path, capacity, ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "model_calls": 0, "model_s": 0.0, "first_chunk_s": 0.0}
+        try:
+            with open(path) as f:
+                self._entries.update((k, tuple(v)) for k, v in json.load(f).items())
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            self._entries.pop(key, None)
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, command):
+        with self._lock:
+            self._entries[key] = (command, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(f"{self.path}.tmp", "w") as f:
+                json.dump(self._entries, f)
+            os.replace(f"{self.path}.tmp", self.path)
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        calls = self.stats["model_calls"]
+        text = f"Cache: {len(self._entries)} entries"
+        if lookups:
+            text += f" · hit rate {self.stats['hits'] / lookups:.0%} of {lookups} lookups"
+        if calls:
+            text += (f" · model first chunk {self.stats['first_chunk_s'] / calls * 1000:.0f} ms, "
+                     f"total {self.stats['model_s'] / calls * 1000:.0f} ms avg over {calls} call(s)")
+        return text
+
+def translate_command(cache, model, text, on_partial=None):
+    """Returns (command, cached) for an utterance, streaming a fresh translation through ``on_partial``."""
+    key = normalize_utterance(text)
+    command = cache.get(key)
+    if command is not None:
+        return command, True
+    started = time.perf_counter()
+    first_chunk = None
+    command = ""
+    for chunk in model.generate_content(TRANSLATION_PROMPT.format(request=text), stream=True):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        command += chunk.text
+        if on_partial:
+            on_partial(command)
+    cache.stats["model_calls"] += 1
+    cache.stats["model_s"] += time.perf_counter() - started
+    cache.stats["first_chunk_s"] += first_chunk or 0.0
+    command = command.strip()
+    if "ERROR:UNCLEAR" not in command:
+        cache.put(key, command)
+    return command, False
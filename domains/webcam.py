@@ -0,0 +1,47 @@
+"""Webcam snapshots: frame statistics and off-thread JPEG encoding."""
+import time
+from collections import deque
+
+class FrameStats:
+    """Frame rate and dropped frames of one webcam stream.
+
+    A frame counts as dropped when the gap since the previous one is more than
+    1.5x the running average interval.
+    """
+    def __init__(self, window=90):
+        self.frames = 0
+        self.dropped = 0
+        self._arrivals = deque(maxlen=window)
+        self._interval = None
+
+    def record(self, timestamp):
+        if self._arrivals:
+            gap = timestamp - self._arrivals[-1]
+            if self._interval and gap > 1.5 * self._interval:
+                self.dropped += round(gap / self._interval) - 1
+            self._interval = gap if self._interval is None else 0.9 * self._interval + 0.1 * gap
+        self._arrivals.append(timestamp)
+        self.frames += 1
+
+    def summary(self):
+        span = self._arrivals[-1] - self._arrivals[0] if len(self._arrivals) > 1 else 0
+        return {
+            "fps": round((len(self._arrivals) - 1) / span, 1) if span else 0.0,
+            "frames": self.frames, "dropped": self.dropped,
+        }
+
+def encode_snapshot(cv2, frame, width=None, quality=90):
+    """Converts a raw video frame to a JPEG, scaled down to ``width`` pixels if given.
+
+    Returns the JPEG bytes and the CPU seconds the conversion, resize and
+    encode took, which is what a host has to budget per snapshot.
+    """
+    cpu_started = time.thread_time()
+    image = frame.to_ndarray(format="bgr24")
+    if width and image.shape[1] > width:
+        height = round(image.shape[0] * width / image.shape[1])
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+    is_success, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not is_success:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes(), time.thread_time() - cpu_started
@@ -1,12 +1,9 @@
+# Credentials come from AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY in the environment,
+# so they are never stored in a saved plan file.
 provider "aws" {
-  region     = "us-east-1"
-  access_key = var.aws_access_key
-  secret_key = var.aws_secret_key
+  region = "us-east-1"
 }
 
-variable "aws_access_key" {}
-variable "aws_secret_key" {}
-
 resource "aws_instance" "app_server" {
   ami           = "ami-0c55b159cbfafe1f0" # Amazon Linux 2 AMI for us-east-1
   instance_type = "t2.micro"